@@ -1,22 +1,36 @@
 import sys
 import os
+import glob
 import argparse
+from functools import partial
+from multiprocessing import Pool
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.image_parser import TangoImageParser
-from src.tango_solver import TangoSolver
+# Import from src/ as top-level modules, the names the tests use too
+from image_parser import TangoImageParser
+from tango_solver import TangoSolver
 
+# Shared parser: templates are loaded once per process, not once per puzzle
+_PARSER = None
 
-def solve_puzzle(image_path, create_gif=False, gif_speed=1, gif_output=None, verbose=False, show_details=False):
+
+def _get_parser():
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = TangoImageParser()
+    return _PARSER
+
+
+def solve_puzzle(image_path, create_gif=False, gif_speed=1, gif_output=None, verbose=False, show_details=False,
+                 use_numba=False):
 
     if show_details:
         print(f"🖼️  Parsing puzzle from: {image_path}")
 
     # Parse image
-    parser = TangoImageParser()
-    board_state = parser.parse_image(image_path)
+    board_state = _get_parser().parse_image(image_path)
 
     if not board_state:
         print("❌ Failed to parse image")
@@ -26,7 +40,7 @@ def solve_puzzle(image_path, create_gif=False, gif_speed=1, gif_output=None, ver
         print(f"✅ Found {len(board_state['fixed_pieces'])} fixed pieces")
         print(f"✅ Found {len(board_state['constraints'])} constraints")
 
-    solver = TangoSolver()
+    solver = TangoSolver(use_numba=use_numba)
 
     for piece in board_state['fixed_pieces']:
         solver.add_fixed_piece(piece['row'], piece['col'], piece['piece_type'])
@@ -75,6 +89,23 @@ def solve_puzzle(image_path, create_gif=False, gif_speed=1, gif_output=None, ver
         return False
 
 
+def _solve_batch_item(image_path, **solve_kwargs):
+    return image_path, solve_puzzle(image_path, **solve_kwargs)
+
+
+def solve_many(image_paths, workers=None, **solve_kwargs):
+    """Solve several puzzles in parallel, yielding (image_path, success) as each one finishes."""
+    worker = partial(_solve_batch_item, **solve_kwargs)
+    with Pool(workers) as pool:
+        yield from pool.imap_unordered(worker, image_paths)
+
+
+def _collect_batch_paths(pattern):
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.png")
+    return sorted(glob.glob(pattern))
+
+
 def main():
 
     parser = argparse.ArgumentParser(
@@ -85,18 +116,27 @@ Examples:
   python3 tango_cli.py examples/sample1.png
   python3 tango_cli.py examples/sample1.png --gif
   python3 tango_cli.py examples/sample1.png --gif --speed 500 --output my_solution.gif
+  python3 tango_cli.py examples --batch
+  python3 tango_cli.py "examples/sample*.png" --batch --workers 4
         """
     )
 
-    parser.add_argument("image", help="Path to puzzle image")
+    parser.add_argument("image", help="Path to puzzle image (directory or glob with --batch)")
     parser.add_argument("--gif", action="store_true", help="Create GIF animation")
     parser.add_argument("--speed", type=int, default=1, help="GIF speed in ms (default: 1)")
-    parser.add_argument("--output", help="Output GIF filename")
+    parser.add_argument("--output", help="Output GIF filename (.png or .webp for an APNG or WebP animation)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
     parser.add_argument("--quiet", "-q", action="store_true", help="Minimal output")
+    parser.add_argument("--batch", action="store_true", help="Solve every image matching a directory or glob in parallel")
+    parser.add_argument("--workers", type=int, help="Worker processes for --batch (default: CPU count)")
+    parser.add_argument("--numba", action="store_true",
+                        help="Search with the numba-compiled kernel (compiles once per process)")
 
     args = parser.parse_args()
 
+    if args.batch:
+        return run_batch(args)
+
     if not os.path.exists(args.image):
         print(f"❌ Image not found: {args.image}")
         return 1
@@ -117,11 +157,39 @@ Examples:
         gif_speed=args.speed,
         gif_output=args.output,
         verbose=verbose,
-        show_details=show_details
+        show_details=show_details,
+        use_numba=args.numba
     )
 
     return 0 if success else 1
 
 
+def run_batch(args):
+    image_paths = _collect_batch_paths(args.image)
+    if not image_paths:
+        print(f"❌ No images found: {args.image}")
+        return 1
+
+    if not args.quiet:
+        print("🎯 TANGO SOLVER")
+        print(f"📂 Solving {len(image_paths)} puzzles")
+        print("=" * 40)
+
+    # Each worker names its GIF after the image, so --output is ignored here
+    solved = 0
+    for image_path, success in solve_many(image_paths, workers=args.workers,
+                                          create_gif=args.gif, gif_speed=args.speed,
+                                          use_numba=args.numba):
+        solved += success
+        if not args.quiet:
+            print(f"{'✅' if success else '❌'} {image_path}")
+
+    if not args.quiet:
+        print("=" * 40)
+        print(f"📊 Solved {solved}/{len(image_paths)} puzzles")
+
+    return 0 if solved == len(image_paths) else 1
+
+
 if __name__ == "__main__":
     sys.exit(main())
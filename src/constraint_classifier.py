@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import Optional, Tuple
 import numpy as np
 
+
 class ConstraintClassifier:
     """
     Constraint classifier for Tango game.
@@ -14,9 +15,9 @@ class ConstraintClassifier:
 
     def classify_constraint(self, image: np.ndarray) -> Optional[str]:
         if len(image.shape) == 3:
-            target_color = np.array([140, 114, 76])
-            color_diff = np.sqrt(np.sum((image - target_color) ** 2, axis=2))
-            mask = (color_diff < 30).astype(np.uint8) * 255
+            diff = image.astype(np.int32) - np.array([140, 114, 76], dtype=np.int32)
+            color_diff_sq = np.einsum('...c,...c->...', diff, diff)
+            mask = color_diff_sq < 900
         else:
             mask = image
 
@@ -25,37 +26,15 @@ class ConstraintClassifier:
         if h < 3 or w < 3:
             return None
 
-        total_pixels = np.sum(mask > 0)
-        if total_pixels < 5:
-            return None
-
-        rows, cols = np.where(mask > 0)
-        if len(rows) == 0:
-            return None
+        features = self._mask_features(mask)
 
-        row_spread = np.std(rows) if len(rows) > 1 else 0
-        col_spread = np.std(cols) if len(cols) > 1 else 0
+        (total_pixels, row_spread, col_spread, q1, q2, q3, q4,
+         horizontal_connectivity, diagonal_connectivity, bbox_width, bbox_height) = features
 
-        mid_h, mid_w = h // 2, w // 2
-
-        q1 = np.sum(mask[0:mid_h, 0:mid_w] > 0)          # Top left
-        q2 = np.sum(mask[0:mid_h, mid_w:w] > 0)          # Top right
-        q3 = np.sum(mask[mid_h:h, 0:mid_w] > 0)          # Bottom left
-        q4 = np.sum(mask[mid_h:h, mid_w:w] > 0)          # Bottom right
-
-        quadrants = [q1, q2, q3, q4]
-        non_zero_quads = sum(1 for q in quadrants if q > 0)
-
-        # Horizontal vs diagonal connectivity analysis
-        horizontal_connectivity = self._count_horizontal_connections(mask)
-        diagonal_connectivity = self._count_diagonal_connections(mask)
-
-        # Bounding box shape analysis
-        min_row, max_row = np.min(rows), np.max(rows)
-        min_col, max_col = np.min(cols), np.max(cols)
+        if total_pixels < 5:
+            return None
 
-        bbox_width = max_col - min_col + 1
-        bbox_height = max_row - min_row + 1
+        non_zero_quads = sum(1 for q in (q1, q2, q3, q4) if q > 0)
         bbox_aspect = bbox_width / bbox_height if bbox_height > 0 else 1
 
         cross_pattern_score = 0
@@ -118,29 +97,50 @@ class ConstraintClassifier:
             else:
                 return 'not_equals'
 
-    def _count_horizontal_connections(self, mask: np.ndarray) -> int:
+    def _mask_features(self, mask: np.ndarray) -> Tuple:
+        """
+        Compute every feature used by the classifier from the mask.
+
+        Returns (total, row_spread, col_spread, q1, q2, q3, q4, horizontal, diagonal,
+        bbox_width, bbox_height).
+        """
         h, w = mask.shape
-        connections = 0
 
-        for r in range(h):
-            for c in range(w-1):
-                if mask[r, c] > 0 and mask[r, c+1] > 0:
-                    connections += 1
+        # Works on bool masks and on 0/255 masks alike
+        filled = mask > 0
+
+        rows, cols = np.nonzero(filled)
+        if len(rows) == 0:
+            return 0, 0.0, 0.0, 0, 0, 0, 0, 0, 0, 0, 0
 
-        return connections
+        row_spread = np.std(rows) if len(rows) > 1 else 0
+        col_spread = np.std(cols) if len(cols) > 1 else 0
 
-    def _count_diagonal_connections(self, mask: np.ndarray) -> int:
-        h, w = mask.shape
-        connections = 0
+        mid_h, mid_w = h // 2, w // 2
+
+        q1 = np.count_nonzero(filled[0:mid_h, 0:mid_w])          # Top left
+        q2 = np.count_nonzero(filled[0:mid_h, mid_w:w])          # Top right
+        q3 = np.count_nonzero(filled[mid_h:h, 0:mid_w])          # Bottom left
+        q4 = np.count_nonzero(filled[mid_h:h, mid_w:w])          # Bottom right
+
+        # Horizontal vs diagonal connectivity analysis
+        horizontal_connectivity = self._count_horizontal_connections(filled)
+        diagonal_connectivity = self._count_diagonal_connections(filled)
+
+        # Bounding box shape analysis
+        bbox_width = np.max(cols) - np.min(cols) + 1
+        bbox_height = np.max(rows) - np.min(rows) + 1
+
+        return (len(rows), row_spread, col_spread, q1, q2, q3, q4,
+                horizontal_connectivity, diagonal_connectivity, bbox_width, bbox_height)
 
-        for r in range(h-1):
-            for c in range(w-1):
-                if mask[r, c] > 0 and mask[r+1, c+1] > 0:
-                    connections += 1
-                if mask[r, c+1] > 0 and mask[r+1, c] > 0:
-                    connections += 1
+    def _count_horizontal_connections(self, filled: np.ndarray) -> int:
+        return int(np.count_nonzero(filled[:, :-1] & filled[:, 1:]))
 
-        return connections
+    def _count_diagonal_connections(self, filled: np.ndarray) -> int:
+        main_diagonal = np.count_nonzero(filled[:-1, :-1] & filled[1:, 1:])
+        anti_diagonal = np.count_nonzero(filled[:-1, 1:] & filled[1:, :-1])
+        return int(main_diagonal + anti_diagonal)
 
     def get_constraint_name(self, constraint_type: str) -> str:
         return "equality" if constraint_type == '=' else "difference"
@@ -30,6 +30,28 @@ class GridDetector:
 
         return grid_coords
 
+    def get_border_slices(self, grid_coords: List[List[Tuple]], img_shape: Tuple[int, ...]) -> Tuple[List, List]:
+        """Precompute the (y_slice, x_slice) pairs of every in-bounds border between cells."""
+        height, width = img_shape[:2]
+        h_border_slices = []
+        v_border_slices = []
+
+        for row in range(self.grid_size):
+            for col in range(self.grid_size):
+                x, y, w, h = grid_coords[row][col]
+
+                # Border with the right neighbour, 20px wide centered on the cell edge
+                border_x = x + w - 10
+                if col < self.grid_size - 1 and border_x >= 0 and border_x + 20 < width:
+                    h_border_slices.append(((row, col), (slice(y, y + h), slice(border_x, border_x + 20))))
+
+                # Border with the neighbour below
+                border_y = y + h - 10
+                if row < self.grid_size - 1 and border_y >= 0 and border_y + 20 < height:
+                    v_border_slices.append(((row, col), (slice(border_y, border_y + 20), slice(x, x + w))))
+
+        return h_border_slices, v_border_slices
+
     def get_cell_image(self, img: np.ndarray, grid_coords: List[List[Tuple]], row: int, col: int) -> np.ndarray:
         if 0 <= row < len(grid_coords) and 0 <= col < len(grid_coords[0]):
             x, y, w, h = grid_coords[row][col]
@@ -1,4 +1,7 @@
 from typing import List, Tuple, Optional, Dict, Any
+import copy
+import os
+from functools import lru_cache
 import cv2
 import numpy as np
 
@@ -13,6 +16,36 @@ except ImportError:
     from piece_detector import PieceDetector
 
 
+# Constraint symbol color (RGB) and the box enclosing every color within
+# distance 30 of it; the box is a cheap superset of the distance check
+CONSTRAINT_COLOR = np.array([140, 114, 76], dtype=np.int32)
+CONSTRAINT_BOX_LOWER = np.array([111, 85, 47], dtype=np.uint8)
+CONSTRAINT_BOX_UPPER = np.array([169, 143, 105], dtype=np.uint8)
+
+# Parsed results keyed by (absolute path, mtime, size), shared by every parser:
+# parsers hold no per-instance settings, so a result depends only on the file
+_PARSE_CACHE = {}
+
+
+@lru_cache(maxsize=4)
+def _read_image(image_path: str, mtime_ns: int, size: int) -> Optional[np.ndarray]:
+    return cv2.imread(image_path)
+
+
+def load_image(image_path: str) -> Optional[np.ndarray]:
+    """
+    cv2.imread for files read repeatedly: the last few decoded images are kept,
+    keyed by (absolute path, mtime, size), and each caller gets its own copy.
+    """
+    try:
+        stat = os.stat(image_path)
+    except OSError:
+        return cv2.imread(image_path)
+
+    img = _read_image(os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size)
+    return None if img is None else img.copy()
+
+
 class TangoImageParser:
     """
     Main parser for extracting information from Tango game images.
@@ -30,16 +63,40 @@ class TangoImageParser:
         self.constraint_classifier = TemplateConstraintClassifier()
 
     def parse_image(self, image_path: str) -> Optional[Dict[str, Any]]:
+        """Parse an image file; repeated calls for an unchanged file reuse the first result."""
         try:
-            img = cv2.imread(image_path)
+            stat = os.stat(image_path)
+            key = (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = None
+
+        if key in _PARSE_CACHE:
+            return copy.deepcopy(_PARSE_CACHE[key])
+
+        board_state = self._parse_image_file(image_path)
+        if board_state is not None and key is not None:
+            _PARSE_CACHE[key] = copy.deepcopy(board_state)
+        return board_state
+
+    def _parse_image_file(self, image_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            img = load_image(image_path)
             if img is None:
                 raise ValueError(f"Could not load image: {image_path}")
 
             img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
 
             grid_coords = self.grid_detector.detect_grid(img_rgb)
+            h_border_slices, v_border_slices = self.grid_detector.get_border_slices(
+                grid_coords, img_rgb.shape
+            )
+
+            img_hsv = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2HSV)
 
-            board_state = self._extract_board_contents(img_rgb, grid_coords)
+            board_state = self._extract_board_contents(img_rgb, img_hsv)
+            board_state['constraints'] = self._detect_edge_constraints(
+                img_rgb, h_border_slices, v_border_slices, self._compute_constraint_mask(img_rgb)
+            )
 
             board_state['grid_coords'] = grid_coords
 
@@ -49,19 +106,19 @@ class TangoImageParser:
             print(f"Error parsing image: {e}")
             return None
 
-    def _extract_board_contents(self, img: np.ndarray, grid_coords: List[List[Tuple]]) -> Dict[str, Any]:
+    def _extract_board_contents(self, img: np.ndarray, img_hsv: Optional[np.ndarray] = None) -> Dict[str, Any]:
         board_state = {
             'fixed_pieces': [],
             'constraints': [],
             'empty_cells': []
         }
 
-        for row in range(6):
-            for col in range(6):
-                x, y, w, h = grid_coords[row][col]
-                cell_img = img[y:y+h, x:x+w]
+        # All cells are classified in one batch over the whole board
+        pieces = self.piece_detector.detect_pieces(img, img_hsv, self.grid_size)
 
-                piece_info = self.piece_detector.detect_piece(cell_img)
+        for row in range(self.grid_size):
+            for col in range(self.grid_size):
+                piece_info = pieces[row][col]
 
                 if piece_info['type'] == 'piece':
                     board_state['fixed_pieces'].append({
@@ -72,72 +129,57 @@ class TangoImageParser:
                 else:
                     board_state['empty_cells'].append((row, col))
 
-        constraints = self._detect_edge_constraints(img, grid_coords)
-        board_state['constraints'] = constraints
-
         return board_state
 
-    def _detect_edge_constraints(self, img: np.ndarray, grid_coords: List[List[Tuple]]) -> List[Dict[str, Any]]:
+    def _compute_constraint_mask(self, img: np.ndarray) -> np.ndarray:
+        """Mask (0/255) of the pixels close to the constraint symbol color, for the whole image."""
+        mask = cv2.inRange(img, CONSTRAINT_BOX_LOWER, CONSTRAINT_BOX_UPPER)
+
+        # Only the few pixels inside the box need the exact distance check
+        # (squared, against 30 ** 2; int32 keeps the squares from overflowing)
+        rows, cols = np.nonzero(mask)
+        diff = img[rows, cols].astype(np.int32) - CONSTRAINT_COLOR
+        too_far = np.einsum('ij,ij->i', diff, diff) >= 900
+        mask[rows[too_far], cols[too_far]] = 0
+        return mask
+
+    def _detect_edge_constraints(self, img: np.ndarray, h_border_slices: List[Tuple], v_border_slices: List[Tuple],
+                                 constraint_mask: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        if constraint_mask is None:
+            constraint_mask = self._compute_constraint_mask(img)
+
         constraints = []
-        height, width = img.shape[:2]
-
-        for row in range(6):
-            for col in range(5):
-                x1, y1, w1, h1 = grid_coords[row][col]
-
-                border_x = x1 + w1 - 10
-                border_y = y1
-                border_w = 20
-                border_h = h1
-
-                if border_x >= 0 and border_x + border_w < width:
-                    border_img = img[border_y:border_y+border_h, border_x:border_x+border_w]
-                    constraint_type = self._analyze_border_for_constraint(border_img, is_horizontal=True)
-
-                    if constraint_type:
-                        constraints.append({
-                            'type': constraint_type,
-                            'pos1': (row, col),
-                            'pos2': (row, col+1)
-                        })
-
-        for row in range(5):
-            for col in range(6):
-                x1, y1, w1, h1 = grid_coords[row][col]
-
-                border_x = x1
-                border_y = y1 + h1 - 10
-                border_w = w1
-                border_h = 20
-
-                if border_y >= 0 and border_y + border_h < height:
-                    border_img = img[border_y:border_y+border_h, border_x:border_x+border_w]
-                    constraint_type = self._analyze_border_for_constraint(border_img, is_horizontal=False)
-
-                    if constraint_type:
-                        constraints.append({
-                            'type': constraint_type,
-                            'pos1': (row, col),
-                            'pos2': (row+1, col)
-                        })
 
-        return constraints
+        for (row, col), border_slice in h_border_slices:
+            constraint_type = self._analyze_border_for_constraint(constraint_mask[border_slice], is_horizontal=True)
 
-    def _analyze_border_for_constraint(self, border_img: np.ndarray, is_horizontal: bool = True) -> Optional[str]:
-        if border_img.size == 0:
-            return None
+            if constraint_type:
+                constraints.append({
+                    'type': constraint_type,
+                    'pos1': (row, col),
+                    'pos2': (row, col+1)
+                })
 
-        # Look specifically for constraint color
-        target_color = np.array([140, 114, 76])
-        color_diff = np.sqrt(np.sum((border_img - target_color) ** 2, axis=2))
-        constraint_pixels = np.sum(color_diff < 30)
+        for (row, col), border_slice in v_border_slices:
+            constraint_type = self._analyze_border_for_constraint(constraint_mask[border_slice], is_horizontal=False)
 
-        if constraint_pixels < 8:
+            if constraint_type:
+                constraints.append({
+                    'type': constraint_type,
+                    'pos1': (row, col),
+                    'pos2': (row+1, col)
+                })
+
+        return constraints
+
+    def _analyze_border_for_constraint(self, constraint_mask: np.ndarray, is_horizontal: bool = True) -> Optional[str]:
+        # `constraint_mask` is the border slice of the precomputed constraint color mask
+        if constraint_mask.size == 0:
             return None
 
-        constraint_mask = (color_diff < 30).astype(np.uint8) * 255
+        constraint_pixels = np.count_nonzero(constraint_mask)
 
-        if np.sum(constraint_mask > 0) < 5:
+        if constraint_pixels < 8:
             return None
 
         classification = self.constraint_classifier.classify_constraint(constraint_mask, is_horizontal)
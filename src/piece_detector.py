@@ -1,51 +1,112 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import cv2
 import numpy as np
 
 
+# Color ranges for HSV detection. OpenCV stores 8-bit hue as 0-179, so the
+# former moon/circle specific ranges (hue 193-254, partly RGB literals) could
+# never match a pixel and have been dropped.
+BLUE_HSV_RANGES = [
+    (np.array([100, 50, 50]), np.array([130, 255, 255])),    # Standard blue
+]
+
+ORANGE_HSV_RANGES = [
+    (np.array([10, 100, 100]), np.array([25, 255, 255])),    # Standard orange
+    (np.array([5, 100, 100]), np.array([15, 255, 255])),     # Wide range for circle variations
+]
+
+
 class PieceDetector:
     def __init__(self):
         pass
 
-    def detect_piece(self, cell_img: np.ndarray) -> Dict[str, Any]:
-
-        hsv = cv2.cvtColor(cell_img, cv2.COLOR_RGB2HSV)
+    def detect_piece(self, cell_img: np.ndarray, cell_hsv: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        # The parser converts the whole board to HSV once and passes the cell slice
+        if cell_hsv is None:
+            cell_hsv = cv2.cvtColor(cell_img, cv2.COLOR_RGB2HSV)
 
         avg_color = np.mean(cell_img.reshape(-1, 3), axis=0)
 
         blue_score = self._detect_blue_by_rgb(avg_color)
         orange_score = self._detect_orange_by_rgb(avg_color)
 
-        # Color ranges for HSV detection
-        blue_ranges = [
-            ([100, 50, 50], [130, 255, 255]),    # Standard blue
-            ([200, 150, 150], [230, 255, 255]),  # Specific range for moon interior
-            ([210, 180, 120], [240, 255, 200]),  # Specific range for moon outline
-            ([195, 100, 100], [245, 255, 255]),  # Wide range for moon variations
-        ]
-
-        orange_ranges = [
-            ([10, 100, 100], [25, 255, 255]),    # Standard orange
-            ([254, 169, 27], [254, 169, 27]),    # Specific range for circle interior
-            ([193, 99, 32], [193, 99, 32]),      # Specific range for circle outline
-            ([5, 100, 100], [15, 255, 255]),     # Wide range for circle variations
-        ]
+        min_pixels = cell_img.shape[0] * cell_img.shape[1] * 0.05
+
+        # Every HSV range needs saturation >= 50, so an unsaturated (empty) cell
+        # can never reach the piece threshold and the range masks can be skipped
+        saturated_pixels = np.count_nonzero(cell_hsv[:, :, 1] >= 50)
+        if saturated_pixels + max(blue_score, orange_score) * 10 <= min_pixels:
+            return {'type': 'empty'}
 
         blue_pixels = 0
         orange_pixels = 0
 
-        for blue_lower, blue_upper in blue_ranges:
-            blue_mask = cv2.inRange(hsv, np.array(blue_lower), np.array(blue_upper))
+        for blue_lower, blue_upper in BLUE_HSV_RANGES:
+            blue_mask = cv2.inRange(cell_hsv, blue_lower, blue_upper)
             blue_pixels = max(blue_pixels, cv2.countNonZero(blue_mask))
 
-        for orange_lower, orange_upper in orange_ranges:
-            orange_mask = cv2.inRange(hsv, np.array(orange_lower), np.array(orange_upper))
+        for orange_lower, orange_upper in ORANGE_HSV_RANGES:
+            orange_mask = cv2.inRange(cell_hsv, orange_lower, orange_upper)
             orange_pixels = max(orange_pixels, cv2.countNonZero(orange_mask))
 
-        min_pixels = cell_img.shape[0] * cell_img.shape[1] * 0.05
-
-        total_blue_score = blue_pixels + blue_score * 10
-        total_orange_score = orange_pixels + orange_score * 10
+        return self._classify_cell(blue_pixels, orange_pixels, avg_color, min_pixels)
+
+    def detect_pieces(self, board_img: np.ndarray, board_hsv: Optional[np.ndarray] = None,
+                      grid_size: int = 6) -> List[List[Dict[str, Any]]]:
+        """
+        Classify every cell of the board at once, as `detect_piece` would.
+
+        The board is split into grid_size x grid_size equal cells, the same tiling
+        as `GridDetector.detect_grid`. Each HSV range is thresholded once over the
+        whole board and the masks and colors are reduced per cell.
+        """
+        if board_hsv is None:
+            board_hsv = cv2.cvtColor(board_img, cv2.COLOR_RGB2HSV)
+
+        cell_height = board_img.shape[0] // grid_size
+        cell_width = board_img.shape[1] // grid_size
+        img = board_img[:cell_height * grid_size, :cell_width * grid_size]
+        hsv = board_hsv[:cell_height * grid_size, :cell_width * grid_size]
+
+        def count_per_cell(mask):
+            return np.count_nonzero(mask.reshape(grid_size, cell_height, grid_size, cell_width), axis=(1, 3))
+
+        blue_pixels = np.zeros((grid_size, grid_size), dtype=np.int64)
+        for blue_lower, blue_upper in BLUE_HSV_RANGES:
+            blue_pixels = np.maximum(blue_pixels, count_per_cell(cv2.inRange(hsv, blue_lower, blue_upper)))
+
+        orange_pixels = np.zeros((grid_size, grid_size), dtype=np.int64)
+        for orange_lower, orange_upper in ORANGE_HSV_RANGES:
+            orange_pixels = np.maximum(orange_pixels, count_per_cell(cv2.inRange(hsv, orange_lower, orange_upper)))
+
+        avg_colors = self.average_cell_colors(img, grid_size)
+        min_pixels = cell_height * cell_width * 0.05
+
+        return [[self._classify_cell(blue_pixels[row, col], orange_pixels[row, col], avg_colors[row, col], min_pixels)
+                 for col in range(grid_size)]
+                for row in range(grid_size)]
+
+    def average_cell_colors(self, board_img: np.ndarray, grid_size: int = 6) -> np.ndarray:
+        """
+        Mean color of every cell, as np.mean over each cell would give.
+
+        Uses the same tiling as `detect_pieces`. The per-cell sums are read from a
+        float64 integral image, which holds them exactly; the default int32 one
+        wraps on large screenshots.
+        """
+        cell_height = board_img.shape[0] // grid_size
+        cell_width = board_img.shape[1] // grid_size
+        img = board_img[:cell_height * grid_size, :cell_width * grid_size]
+
+        corners = cv2.integral(img, sdepth=cv2.CV_64F)[np.ix_(np.arange(grid_size + 1) * cell_height,
+                                                              np.arange(grid_size + 1) * cell_width)]
+        color_sums = corners[1:, 1:] - corners[:-1, 1:] - corners[1:, :-1] + corners[:-1, :-1]
+        return color_sums / (cell_height * cell_width)
+
+    def _classify_cell(self, blue_pixels: int, orange_pixels: int, avg_color: np.ndarray,
+                       min_pixels: float) -> Dict[str, Any]:
+        total_blue_score = blue_pixels + self._detect_blue_by_rgb(avg_color) * 10
+        total_orange_score = orange_pixels + self._detect_orange_by_rgb(avg_color) * 10
 
         if total_blue_score > min_pixels and total_blue_score > total_orange_score:
             return {'type': 'piece', 'piece_type': 0}  # Moon
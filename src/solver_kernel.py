@@ -0,0 +1,212 @@
+"""
+Numba-compiled counterpart of the `TangoSolver` search.
+
+Importing this module requires numba; `TangoSolver` only imports it when
+created with use_numba=True. The kernels are compiled in every process that
+uses them: there is no on-disk cache, whose entries are tied to the name the
+module was imported under.
+"""
+
+import numpy as np
+from numba import njit
+
+try:
+    from .tango_solver import BOARD_SIZE, EMPTY, LINE_CELLS, LINE_MASKS, TRIPLES_AT
+except ImportError:
+    from tango_solver import BOARD_SIZE, EMPTY, LINE_CELLS, LINE_MASKS, TRIPLES_AT
+
+
+# Flat copies of the tango_solver tables for the kernels, indexed by
+# r * BOARD_SIZE + c: the windows of cell i are KERNEL_TRIPLES[KERNEL_TRIPLE_START[i]:KERNEL_TRIPLE_START[i + 1]]
+KERNEL_TRIPLES = np.array([t for row in TRIPLES_AT for triples in row for t in triples], dtype=np.int64)
+KERNEL_TRIPLE_START = np.cumsum([0] + [len(triples) for row in TRIPLES_AT for triples in row]).astype(np.int64)
+KERNEL_LINE_MASKS = np.array([m for row in LINE_MASKS for m in row], dtype=np.int64)
+KERNEL_LINE_CELLS = np.array([[r * BOARD_SIZE + c for r, c in cells] for row in LINE_CELLS for cells in row],
+                             dtype=np.int64)
+
+
+@njit
+def _can_place(index, piece, masks, row_count, col_count, equal, differ):
+    """Kernel counterpart of `TangoSolver._can_place` for an empty cell."""
+    r, c = index // BOARD_SIZE, index % BOARD_SIZE
+    half = BOARD_SIZE // 2
+    if row_count[r, piece] >= half or col_count[c, piece] >= half:
+        return False
+
+    placed = masks[piece] | (np.int64(1) << index)
+    for k in range(KERNEL_TRIPLE_START[index], KERNEL_TRIPLE_START[index + 1]):
+        if placed & KERNEL_TRIPLES[k] == KERNEL_TRIPLES[k]:
+            return False
+    return (equal[index] & masks[1 - piece]) == 0 and (differ[index] & masks[piece]) == 0
+
+
+@njit
+def _place(index, piece, board, masks, row_count, col_count):
+    board[index] = piece
+    masks[piece] |= np.int64(1) << index
+    row_count[index // BOARD_SIZE, piece] += 1
+    col_count[index % BOARD_SIZE, piece] += 1
+
+
+@njit
+def _remove(index, board, masks, row_count, col_count):
+    piece = board[index]
+    board[index] = EMPTY
+    masks[piece] ^= np.int64(1) << index
+    row_count[index // BOARD_SIZE, piece] -= 1
+    col_count[index % BOARD_SIZE, piece] -= 1
+
+
+@njit
+def _propagate_board(board, masks, row_count, col_count, equal, differ, trail, top, pending):
+    """
+    Kernel counterpart of `TangoSolver._propagate`.
+
+    `pending` is the bitmask of cells to examine. Forced cells are pushed onto
+    `trail`; returns the new trail top, or -1 after undoing this call's
+    deductions when a cell has no legal value left.
+    """
+    start = top
+    while pending != 0:
+        index = 0
+        while (pending >> index) & 1 == 0:
+            index += 1
+        pending &= ~(np.int64(1) << index)
+        if board[index] != EMPTY:
+            continue
+        can_moon = _can_place(index, 0, masks, row_count, col_count, equal, differ)
+        can_sun = _can_place(index, 1, masks, row_count, col_count, equal, differ)
+        if can_moon and can_sun:
+            continue
+        if not can_moon and not can_sun:
+            while top > start:
+                top -= 1
+                _remove(trail[top], board, masks, row_count, col_count)
+            return -1
+        _place(index, 0 if can_moon else 1, board, masks, row_count, col_count)
+        trail[top] = index
+        top += 1
+        pending |= KERNEL_LINE_MASKS[index]
+    return top
+
+
+@njit
+def _placement_pressure(board, masks, row_count, col_count, equal, differ, index, piece):
+    """Kernel counterpart of `TangoSolver._placement_pressure`."""
+    _place(index, piece, board, masks, row_count, col_count)
+
+    pressure = 0
+    for k in range(KERNEL_LINE_CELLS.shape[1]):
+        other = KERNEL_LINE_CELLS[index, k]
+        if board[other] != EMPTY:
+            continue
+        legal = (int(_can_place(other, 0, masks, row_count, col_count, equal, differ)) +
+                 int(_can_place(other, 1, masks, row_count, col_count, equal, differ)))
+        if legal == 0:
+            pressure += 11
+        elif legal == 1:
+            pressure += 1
+
+    _remove(index, board, masks, row_count, col_count)
+    return pressure
+
+
+@njit
+def _branch_cell(board, masks, row_count, col_count, equal, differ):
+    """Kernel counterpart of `TangoSolver._next_empty_cell`; -1 when the board is full."""
+    best = -1
+    best_low, best_high = -1, -1
+    for index in range(board.shape[0]):
+        if board[index] != EMPTY:
+            continue
+        moon = _placement_pressure(board, masks, row_count, col_count, equal, differ, index, 0)
+        sun = _placement_pressure(board, masks, row_count, col_count, equal, differ, index, 1)
+        low, high = min(moon, sun), max(moon, sun)
+        if low > best_low or (low == best_low and high > best_high):
+            best = index
+            best_low, best_high = low, high
+    return best
+
+
+@njit
+def solve_board(board, masks, row_count, col_count, equal, differ):
+    """
+    Backtracking search with propagation over a flat int8 board (EMPTY = -1).
+
+    The remaining arguments mirror the `TangoSolver` state: the [moons, suns]
+    bitboards, the (size, 2) row/column counts and the per-cell '=' and 'x'
+    neighbour bitboards. Clues between fixed pieces are assumed to hold
+    (`TangoSolver.solve` checks them up front). The search visits cells and
+    values in the same order as `TangoSolver._backtrack`, so both report the
+    same steps. The state is left solved on success and restored on failure.
+    Returns (solved, steps).
+    """
+    n_cells = board.shape[0]
+
+    # Every placement (branch or forced) goes on the trail; each search level
+    # remembers where its own placements start so they can be undone together
+    trail = np.zeros(n_cells, dtype=np.int64)
+    top = 0
+    mark = np.zeros(n_cells + 1, dtype=np.int64)
+    cell = np.zeros(n_cells + 1, dtype=np.int64)
+    next_piece = np.zeros(n_cells + 1, dtype=np.int64)
+    half = BOARD_SIZE // 2
+    steps = 0
+    depth = 0
+    entering = True
+    # On an empty board only moons are tried at the first branch (see `TangoSolver._backtrack`)
+    symmetric = (masks[0] | masks[1]) == 0
+
+    while True:
+        if entering:
+            entering = False
+            mark[depth] = top
+            if depth == 0:
+                pending = (np.int64(1) << n_cells) - 1
+            else:
+                pending = KERNEL_LINE_MASKS[cell[depth - 1]]
+            top = _propagate_board(board, masks, row_count, col_count, equal, differ, trail, top, pending)
+            failed = top < 0
+            if failed:
+                top = mark[depth]
+            else:
+                index = _branch_cell(board, masks, row_count, col_count, equal, differ)
+                if index >= 0:
+                    cell[depth] = index
+                    next_piece[depth] = 0
+                else:
+                    complete = True
+                    for i in range(BOARD_SIZE):
+                        if (row_count[i, 0] != half or row_count[i, 1] != half or
+                                col_count[i, 0] != half or col_count[i, 1] != half):
+                            complete = False
+                    if complete:
+                        return True, steps
+                    failed = True
+        else:
+            failed = False
+            index = cell[depth]
+            piece = next_piece[depth]
+            if piece == 2 or (piece == 1 and depth == 0 and symmetric):
+                failed = True
+            else:
+                next_piece[depth] = piece + 1
+                steps += 1
+                if _can_place(index, piece, masks, row_count, col_count, equal, differ):
+                    _place(index, piece, board, masks, row_count, col_count)
+                    trail[top] = index
+                    top += 1
+                    depth += 1
+                    entering = True
+                continue
+
+        if failed:
+            # Undo this level's placements and resume the parent level
+            while top > mark[depth]:
+                top -= 1
+                _remove(trail[top], board, masks, row_count, col_count)
+            if depth == 0:
+                return False, steps
+            depth -= 1
+            top -= 1
+            _remove(trail[top], board, masks, row_count, col_count)
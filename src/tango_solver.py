@@ -9,120 +9,205 @@ Game rules:
 5. "x" clues indicate adjacent cells must have different types
 """
 
+import queue
+import threading
+from functools import lru_cache
+
+import numpy as np
+
 try:
     from .visualizer import BoardVisualizer
 except ImportError:
     from visualizer import BoardVisualizer
 
 
+# Cell value used for empty cells, and the clue types the solver understands
+EMPTY = -1
+SUPPORTED_CLUES = frozenset({'=', 'x'})
+
+# Bitboard layout for the Python search: bit r * BOARD_SIZE + c is cell (r, c)
+BOARD_SIZE = 6
+CELL_BITS = [[1 << (r * BOARD_SIZE + c) for c in range(BOARD_SIZE)] for r in range(BOARD_SIZE)]
+
+
+def _triples_through(row, col):
+    """Masks of the (up to 6) three-cell windows in a row or column that contain (row, col)."""
+    triples = []
+    for start in range(max(0, col - 2), min(BOARD_SIZE - 2, col + 1)):
+        triples.append(CELL_BITS[row][start] | CELL_BITS[row][start + 1] | CELL_BITS[row][start + 2])
+    for start in range(max(0, row - 2), min(BOARD_SIZE - 2, row + 1)):
+        triples.append(CELL_BITS[start][col] | CELL_BITS[start + 1][col] | CELL_BITS[start + 2][col])
+    return tuple(triples)
+
+
+TRIPLES_AT = [[_triples_through(r, c) for c in range(BOARD_SIZE)] for r in range(BOARD_SIZE)]
+
+# A placement can only change the options of cells in its own row and column
+ROW_MASKS = [sum(CELL_BITS[r]) for r in range(BOARD_SIZE)]
+COL_MASKS = [sum(CELL_BITS[r][c] for r in range(BOARD_SIZE)) for c in range(BOARD_SIZE)]
+LINE_MASKS = [[ROW_MASKS[r] | COL_MASKS[c] for c in range(BOARD_SIZE)] for r in range(BOARD_SIZE)]
+LINE_CELLS = [[tuple((r, i) for i in range(BOARD_SIZE) if i != c) + tuple((i, c) for i in range(BOARD_SIZE) if i != r)
+               for c in range(BOARD_SIZE)]
+              for r in range(BOARD_SIZE)]
+ALL_CELLS = (1 << (BOARD_SIZE * BOARD_SIZE)) - 1
+
+
+@lru_cache(maxsize=None)
+def _load_kernel():
+    """The numba search kernel, imported on first use; None when numba is not installed."""
+    try:
+        import numba  # noqa: F401
+    except ImportError:
+        return None
+
+    try:
+        from . import solver_kernel
+    except ImportError:
+        import solver_kernel
+    return solver_kernel
+
+
 class TangoSolver:
-    def __init__(self):
-        self.size = 6
-        self.board = [[None for _ in range(self.size)] for _ in range(self.size)]
+    def __init__(self, use_numba=False):
+        self.size = BOARD_SIZE
+        # The Python search solves a 6x6 board in milliseconds; the numba
+        # kernel only pays back its import and compile time over many boards
+        self.use_numba = use_numba
+        self.board = np.full((self.size, self.size), EMPTY, dtype=np.int8)
         self.constraints = []
+        # Per cell, bitboards of the cells tied to it by a '=' or an 'x' clue
+        self.equal_neighbours = [[0] * self.size for _ in range(self.size)]
+        self.differ_neighbours = [[0] * self.size for _ in range(self.size)]
+        # Clue marker shown on empty cells by `print_board_with_constraints`
+        self.constraint_symbols = {}
         self.fixed_pieces = []
         self.steps = 0
 
+        # Running [moons, suns] count per row and per column
+        self.row_count = [[0, 0] for _ in range(self.size)]
+        self.col_count = [[0, 0] for _ in range(self.size)]
+
+        # Bitboards of the [moons, suns] and of all filled cells, kept in sync
+        # with `board`; the Python search reads only these
+        self.masks = [0, 0]
+        self.filled = 0
+
         # Visualization settings
         self._visualizer = None
         self._create_gif = False
         self._gif_speed = 400
+        self._frame_queue = None
+        self._render_thread = None
 
     def add_constraint(self, constraint_type, pos1, pos2):
         self.constraints.append((constraint_type, pos1, pos2))
+        if constraint_type in SUPPORTED_CLUES:
+            neighbours = self.equal_neighbours if constraint_type == '=' else self.differ_neighbours
+            (r1, c1), (r2, c2) = pos1, pos2
+            neighbours[r1][c1] |= CELL_BITS[r2][c2]
+            neighbours[r2][c2] |= CELL_BITS[r1][c1]
+
+            symbol = '🟢' if constraint_type == '=' else '🔴'
+            self.constraint_symbols[(r1, c1)] = symbol
+            self.constraint_symbols[(r2, c2)] = symbol
 
     def add_fixed_piece(self, row, col, piece_type):
-        self.board[row][col] = piece_type
+        if self.board[row, col] != EMPTY:
+            self._remove_piece(row, col)
+        self._place_piece(row, col, piece_type)
         self.fixed_pieces.append((row, col, piece_type))
 
         if self._create_gif and self._visualizer:
-            self._visualizer.save_frame(
-                self.board,
-                self.constraints,
-                (row, col),
-                f"Fixed piece: {piece_type} at ({row}, {col})"
-            )
+            self._save_frame((row, col), f"Fixed piece: {piece_type} at ({row}, {col})")
 
     def is_valid_placement(self, row, col, piece_type):
-        temp_board = [r[:] for r in self.board]
-        temp_board[row][col] = piece_type
-
-        if not self._check_row_column_constraints(temp_board, row, col):
-            return False
-
-        if not self._check_no_three_consecutive(temp_board, row, col):
-            return False
-
-        if not self._check_equality_constraints(temp_board, row, col):
+        """Place the piece if it is valid; the cell is left empty otherwise"""
+        if not self._can_place(row, col, piece_type):
             return False
 
+        self._place_piece(row, col, piece_type)
         return True
 
-    def _check_row_column_constraints(self, board, row, col):
-        row_count = [0, 0]
-        for c in range(self.size):
-            if board[row][c] is not None:
-                row_count[board[row][c]] += 1
-
-        col_count = [0, 0]
-        for r in range(self.size):
-            if board[r][col] is not None:
-                col_count[board[r][col]] += 1
-
-        return all(count <= 3 for count in row_count + col_count)
-
-    def _check_no_three_consecutive(self, board, row, col):
-        piece_type = board[row][col]
-
-        for start_col in range(max(0, col - 2), min(self.size - 2, col + 1)):
-            if all(board[row][start_col + i] == piece_type for i in range(3)):
-                return False
+    def _can_place(self, row, col, piece_type):
+        """Check a piece for an empty cell without changing the board"""
+        if not self._check_row_column_constraints(row, col, piece_type):
+            return False
 
-        for start_row in range(max(0, row - 2), min(self.size - 2, row + 1)):
-            if all(board[start_row + i][col] == piece_type for i in range(3)):
+        return (self._check_no_three_consecutive(self.masks[piece_type], row, col) and
+                self._check_equality_constraints(row, col, piece_type))
+
+    def _place_piece(self, row, col, piece_type):
+        bit = CELL_BITS[row][col]
+        self.board[row, col] = piece_type
+        self.masks[piece_type] |= bit
+        self.filled |= bit
+        self.row_count[row][piece_type] += 1
+        self.col_count[col][piece_type] += 1
+
+    def _remove_piece(self, row, col):
+        bit = CELL_BITS[row][col]
+        piece_type = 1 if self.masks[1] & bit else 0
+        self.board[row, col] = EMPTY
+        self.masks[piece_type] ^= bit
+        self.filled ^= bit
+        self.row_count[row][piece_type] -= 1
+        self.col_count[col][piece_type] -= 1
+
+    def _check_row_column_constraints(self, row, col, piece_type):
+        # Called before placing, so the count must still be below the limit
+        half = self.size // 2
+        return self.row_count[row][piece_type] < half and self.col_count[col][piece_type] < half
+
+    def _check_no_three_consecutive(self, mask, row, col):
+        # Only the windows through the new piece can become a triple
+        mask |= CELL_BITS[row][col]
+        for triple in TRIPLES_AT[row][col]:
+            if mask & triple == triple:
                 return False
-
         return True
 
-    def _check_equality_constraints(self, board, row, col):
-        for constraint_type, pos1, pos2 in self.constraints:
-            r1, c1 = pos1
-            r2, c2 = pos2
+    def _check_equality_constraints(self, row, col, piece_type):
+        # Only clues touching (row, col) can be broken by the new piece: a '='
+        # neighbour holding the other piece, or an 'x' neighbour holding this one
+        return not (self.equal_neighbours[row][col] & self.masks[1 - piece_type] or
+                    self.differ_neighbours[row][col] & self.masks[piece_type])
 
-            if board[r1][c1] is not None and board[r2][c2] is not None:
-                if constraint_type == '=':
-                    if board[r1][c1] != board[r2][c2]:
-                        return False
-                elif constraint_type == 'x':
-                    if board[r1][c1] == board[r2][c2]:
-                        return False
+    def _has_broken_clue(self):
+        """Check whether the fixed pieces already break a '=' or 'x' clue"""
+        for constraint_type, (r1, c1), (r2, c2) in self.constraints:
+            first, second = self.board[r1, c1], self.board[r2, c2]
+            if first == EMPTY or second == EMPTY:
+                continue
 
-        return True
+            if constraint_type == '=' and first != second:
+                return True
+            if constraint_type == 'x' and first == second:
+                return True
 
-    def is_complete(self):
-        for row in self.board:
-            if None in row:
-                return False
+        return False
 
-        for i in range(self.size):
-            row_count = [0, 0]
-            col_count = [0, 0]
-
-            for j in range(self.size):
-                row_count[self.board[i][j]] += 1
-                col_count[self.board[j][i]] += 1
-
-            if row_count != [3, 3] or col_count != [3, 3]:
-                return False
+    def is_complete(self):
+        if self.filled != ALL_CELLS:
+            return False
 
-        return True
+        # With no empty cells left, the sun count alone fixes the moon count
+        half = self.size // 2
+        return (all(count[1] == half for count in self.row_count) and
+                all(count[1] == half for count in self.col_count))
 
     def solve(self, create_gif=False, gif_speed=400, gif_output="solving_animation.gif"):
 
         if create_gif:
             self._enable_gif_creation(gif_speed)
 
-        result = self._backtrack()
+        if self._has_broken_clue():
+            result = False
+        elif create_gif:
+            result = self._backtrack_gif()
+        elif self.use_numba and _load_kernel() is not None:
+            result = self._solve_compiled()
+        else:
+            result = self._backtrack()
 
         if create_gif and self._visualizer:
             self._finalize_gif(result, gif_output)
@@ -133,22 +218,30 @@ class TangoSolver:
         self._create_gif = True
         self._gif_speed = gif_speed
         self._visualizer = BoardVisualizer()
-        self._visualizer.save_frame(
-            self.board,
-            self.constraints,
-            None,
-            f"Step {self.steps}: Initial board"
-        )
+
+        # Frames are rendered on a worker thread so the search does not wait
+        # on PIL; the queue keeps them in order
+        self._frame_queue = queue.Queue()
+        self._render_thread = threading.Thread(target=self._render_frames, daemon=True)
+        self._render_thread.start()
+
+        self._save_frame(None, f"Step {self.steps}: Initial board")
+
+    def _render_frames(self):
+        while True:
+            frame = self._frame_queue.get()
+            if frame is None:
+                return
+            self._visualizer.save_frame(*frame)
 
     def _finalize_gif(self, solved, output_path):
         """Create final GIF"""
         status = "SOLVED" if solved else "NO SOLUTION"
-        self._visualizer.save_frame(
-            self.board,
-            self.constraints,
-            None,
-            f"Step {self.steps}: {status}"
-        )
+        self._save_frame(None, f"Step {self.steps}: {status}")
+
+        # Wait for the worker to render every queued frame
+        self._frame_queue.put(None)
+        self._render_thread.join()
 
         gif_path = self._visualizer.create_gif(
             output_path=output_path,
@@ -158,78 +251,193 @@ class TangoSolver:
 
         return gif_path
 
-    def _backtrack(self):
+    def _solve_compiled(self):
+        """Run the numba kernel on copies of the search state and copy the result back"""
+        kernel = _load_kernel()
+        masks = np.array(self.masks, dtype=np.int64)
+        row_count = np.array(self.row_count, dtype=np.int64)
+        col_count = np.array(self.col_count, dtype=np.int64)
+        equal = np.array(self.equal_neighbours, dtype=np.int64).reshape(-1)
+        differ = np.array(self.differ_neighbours, dtype=np.int64).reshape(-1)
+
+        # reshape(-1) is a view, so the kernel fills `self.board` in place
+        solved, steps = kernel.solve_board(self.board.reshape(-1), masks, row_count, col_count, equal, differ)
+        self.steps += int(steps)
+
+        self.masks = [int(mask) for mask in masks]
+        self.filled = self.masks[0] | self.masks[1]
+        self.row_count = row_count.tolist()
+        self.col_count = col_count.tolist()
+
+        return bool(solved)
+
+    def _propagate(self, pending=ALL_CELLS):
+        """
+        Fill every empty cell that has a single legal piece left, repeating
+        until nothing changes. This covers full rows/columns, '='/'x' clues
+        next to a placed piece and pairs that would become three in a row.
+
+        `pending` is the bitboard of cells to examine; each forced piece queues
+        its row and column again, since no other cell can be affected.
+
+        Returns the list of filled cells, or None (with the deductions undone)
+        when some cell has no legal piece at all.
+        """
+        forced = []
+        pending &= ~self.filled
+
+        while pending:
+            bit = pending & -pending
+            pending ^= bit
+            row, col = divmod(bit.bit_length() - 1, self.size)
+
+            can_moon = self._can_place(row, col, 0)
+            can_sun = self._can_place(row, col, 1)
+
+            if not can_moon and not can_sun:
+                for forced_row, forced_col in reversed(forced):
+                    self._remove_piece(forced_row, forced_col)
+                return None
+
+            if can_moon != can_sun:
+                piece_type = 0 if can_moon else 1
+                self._place_piece(row, col, piece_type)
+                forced.append((row, col))
+                pending = (pending | LINE_MASKS[row][col]) & ~self.filled
+
+                if self._create_gif and self._visualizer:
+                    self._save_frame((row, col), f"Step {self.steps}: Forced {piece_type} at ({row}, {col})")
+
+        return forced
+
+    def _next_empty_cell(self):
+        """
+        Pick the cell to branch on, or None when the board is full.
+
+        After propagation every empty cell still allows both pieces, so plain
+        minimum-remaining-values cannot tell them apart. Instead look one
+        placement ahead: prefer the cell whose weaker piece (then stronger
+        piece) puts the most pressure on its row and column. Ties go to the
+        first cell in row-major order.
+
+        `_backtrack` still tries the moon first: ordering the two pieces by
+        pressure, or breaking ties by clue count, did not shrink the search.
+        """
+        best_cell, best_score = None, None
+
         for row in range(self.size):
             for col in range(self.size):
-                if self.board[row][col] is None:
-                    for piece_type in [0, 1]:
-                        self.steps += 1
-
-                        if self._create_gif and self._visualizer:
-                            self._visualizer.save_frame(
-                                self.board,
-                                self.constraints,
-                                (row, col),
-                                f"Step {self.steps}: Trying {piece_type} at ({row}, {col})"
-                            )
-
-                        if self.is_valid_placement(row, col, piece_type):
-                            self.board[row][col] = piece_type
-
-                            if self._create_gif and self._visualizer:
-                                self._visualizer.save_frame(
-                                    self.board,
-                                    self.constraints,
-                                    (row, col),
-                                    f"Step {self.steps}: Placed {piece_type} at ({row}, {col})"
-                                )
-
-                            if self._backtrack():
-                                return True
-
-                            self.board[row][col] = None
-
-                            if self._create_gif and self._visualizer:
-                                self._visualizer.save_frame(
-                                    self.board,
-                                    self.constraints,
-                                    (row, col),
-                                    f"Step {self.steps}: Backtracking from ({row}, {col})"
-                                )
-                    return False
-        return self.is_complete()
+                if self.filled & CELL_BITS[row][col]:
+                    continue
+
+                moon = self._placement_pressure(row, col, 0)
+                sun = self._placement_pressure(row, col, 1)
+                score = (moon, sun) if moon < sun else (sun, moon)
+                if best_score is None or score > best_score:
+                    best_cell, best_score = (row, col), score
+
+        return best_cell
+
+    def _placement_pressure(self, row, col, piece_type):
+        """
+        Count the empty cells sharing a row or column with (row, col) that
+        would be left with a single legal piece (a cell with none counts 11)
+        if `piece_type` were placed there. No other cell can be affected.
+        """
+        self._place_piece(row, col, piece_type)
+
+        pressure = 0
+        for other_row, other_col in LINE_CELLS[row][col]:
+            if self.filled & CELL_BITS[other_row][other_col]:
+                continue
+
+            legal = self._can_place(other_row, other_col, 0) + self._can_place(other_row, other_col, 1)
+            if legal == 0:
+                pressure += 11
+            elif legal == 1:
+                pressure += 1
+
+        self._remove_piece(row, col)
+        return pressure
+
+    def _backtrack(self, last_cell=None):
+        # No cache of dead boards is needed: two branches first differ in the
+        # value of one cell, which neither undoes below that point, so no
+        # partial board can be reached twice during the search
+        forced = self._propagate(ALL_CELLS if last_cell is None else LINE_MASKS[last_cell[0]][last_cell[1]])
+        if forced is None:
+            return False
 
-    def print_board_with_constraints(self):
-        constraint_map = {}
+        cell = self._next_empty_cell()
+
+        if cell is None:
+            if self.is_complete():
+                return True
+        else:
+            row, col = cell
+            # Swapping moons and suns maps a solution to a solution, clues
+            # included, so on an empty board the first branch needs one value
+            pieces = (0,) if last_cell is None and not self.filled else (0, 1)
+            for piece_type in pieces:
+                self.steps += 1
+
+                if self.is_valid_placement(row, col, piece_type):
+                    if self._backtrack((row, col)):
+                        return True
+
+                    self._remove_piece(row, col)
+
+        for row, col in reversed(forced):
+            self._remove_piece(row, col)
+        return False
+
+    def _backtrack_gif(self, last_cell=None):
+        """`_backtrack` with a frame for every try, placement and undo"""
+        forced = self._propagate(ALL_CELLS if last_cell is None else LINE_MASKS[last_cell[0]][last_cell[1]])
+        if forced is None:
+            return False
+
+        cell = self._next_empty_cell()
 
-        for constraint_type, pos1, pos2 in self.constraints:
-            if constraint_type == '=':
-                constraint_map[pos1] = '🟢'
-                constraint_map[pos2] = '🟢'
-            elif constraint_type == 'x':
-                constraint_map[pos1] = '🔴'
-                constraint_map[pos2] = '🔴'
+        if cell is None:
+            if self.is_complete():
+                return True
+        else:
+            row, col = cell
+            pieces = (0,) if last_cell is None and not self.filled else (0, 1)
+            for piece_type in pieces:
+                self.steps += 1
+                self._save_frame((row, col), f"Step {self.steps}: Trying {piece_type} at ({row}, {col})")
 
-        symbols = {0: '🌙', 1: '🟠', None: '⬜'}
+                if self.is_valid_placement(row, col, piece_type):
+                    self._save_frame((row, col), f"Step {self.steps}: Placed {piece_type} at ({row}, {col})")
+
+                    if self._backtrack_gif((row, col)):
+                        return True
+
+                    self._remove_piece(row, col)
+                    self._save_frame((row, col), f"Step {self.steps}: Backtracking from ({row}, {col})")
+
+        for row, col in reversed(forced):
+            self._remove_piece(row, col)
+        return False
+
+    def _save_frame(self, highlight_cell, message):
+        """Queue a frame of the current board for the render thread"""
+        self._frame_queue.put((self.board.copy(), list(self.constraints), highlight_cell, message))
+
+    def print_board_with_constraints(self):
+        symbols = {0: '🌙', 1: '🟠', EMPTY: '⬜'}
 
         print("Board with constraints (🟢 = equals, 🔴 = not-equals):")
-        for row_idx, row in enumerate(self.board):
-            row_str = ""
-            for col_idx, cell in enumerate(row):
-                pos = (row_idx, col_idx)
-
-                if cell is not None:
-                    row_str += symbols[cell] + " "
-                elif pos in constraint_map:
-                    row_str += constraint_map[pos] + " "
-                else:
-                    row_str += symbols[None] + " "
-
-            print(row_str.strip())
+        for row_idx, row in enumerate(self.board.tolist()):
+            print(' '.join(symbols[cell] if cell != EMPTY else
+                           self.constraint_symbols.get((row_idx, col_idx), symbols[EMPTY])
+                           for col_idx, cell in enumerate(row)))
         print()
 
     def print_board(self):
-        symbols = {0: '🌙', 1: '🟠', None: '⬜'}
+        symbols = {0: '🌙', 1: '🟠', EMPTY: '⬜'}
 
         for row in self.board:
             print(' '.join(symbols[cell] for cell in row))
@@ -238,7 +446,7 @@ class TangoSolver:
     def print_board_simple(self):
         """Print the board in simple format (for debugging)"""
         for row in self.board:
-            print(' '.join(str(cell) if cell is not None else '.' for cell in row))
+            print(' '.join(str(cell) if cell != EMPTY else '.' for cell in row))
         print()
 
     def get_steps(self):
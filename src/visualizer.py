@@ -1,11 +1,34 @@
+import mmap
 import os
-import shutil
 from PIL import Image, ImageDraw, ImageFont
 from pathlib import Path
 
 
+TITLE_FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+CELL_FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+
+# Output extensions create_gif writes as a true-color animation instead of a
+# GIF, with the Pillow save options for each
+ANIMATION_SAVE_OPTIONS = {
+    '.png': {'format': 'PNG'},
+    '.apng': {'format': 'PNG'},
+    '.webp': {'format': 'WEBP', 'lossless': True, 'method': 0, 'quality': 50},
+}
+
+
+class _LazyFrames:
+    """Re-iterable frames loaded on demand; the APNG writer walks append_images twice."""
+
+    def __init__(self, load, keys):
+        self._load = load
+        self._keys = keys
+
+    def __iter__(self):
+        return (self._load(key) for key in self._keys)
+
+
 class BoardVisualizer:
-    def __init__(self, board_size=6, cell_size=60, margin=20, top_margin=50):
+    def __init__(self, board_size=6, cell_size=60, margin=20, top_margin=50, low_memory=False):
         self.board_size = board_size
         self.cell_size = cell_size
         self.margin = margin
@@ -24,12 +47,31 @@ class BoardVisualizer:
             'constraint_diff': (255, 0, 0),
         }
 
+        # Frames are kept in memory unless low_memory is set, in which case their
+        # raw RGB bytes are appended to one file in frames_dir (created on the
+        # first save) and `frames` holds each frame's byte offset in it
         self.step_counter = 0
+        self.low_memory = low_memory
+        self.frames = []
         self.frames_dir = "solver_frames"
-        self._setup_frames_dir()
+        self._frames_file = None
 
-        # Load piece templates
+        # Load piece templates and fonts once, not per frame
         self._load_piece_templates()
+        self._load_fonts()
+
+        # Left edge of each column and top edge of each row
+        self._cell_xs = [self.margin + col * self.cell_size for col in range(self.board_size)]
+        self._cell_ys = [self.top_margin + row * self.cell_size for row in range(self.board_size)]
+
+        # Every frame starts as a copy of the empty board
+        self._background = self._render_background()
+        self._cell_tiles = self._render_cell_tiles()
+
+        # Bounding box of the clue marker drawn at the center of each cell
+        constraint_size = 8
+        self._marker_boxes = [[self._marker_box(row, col, constraint_size) for col in range(self.board_size)]
+                              for row in range(self.board_size)]
 
     def _load_piece_templates(self):
         """Load moon and sun templates from templates directory."""
@@ -45,25 +87,83 @@ class BoardVisualizer:
             if sun_path.exists():
                 self.piece_templates[1] = Image.open(sun_path).convert('RGBA')
 
+            # Pieces are always drawn at the same size, so resize them once
+            padding = 8
+            target_size = self.cell_size - 2 * padding
+            self._piece_sprites = {
+                piece_type: template.resize((target_size, target_size), Image.Resampling.LANCZOS)
+                for piece_type, template in self.piece_templates.items()
+            }
+
         except Exception as e:
             print(f"Warning: Could not load piece templates: {e}")
             self.piece_templates = {}
+            self._piece_sprites = {}
+
+    def _load_fonts(self):
+        """Load the title and cell fonts, falling back to PIL's default font."""
+        try:
+            self.title_font = ImageFont.truetype(TITLE_FONT_PATH, 14)
+        except Exception:
+            self.title_font = ImageFont.load_default()
 
-    def _setup_frames_dir(self):
-        if os.path.exists(self.frames_dir):
-            shutil.rmtree(self.frames_dir)
-        os.makedirs(self.frames_dir)
+        try:
+            self.cell_font = ImageFont.truetype(CELL_FONT_PATH, 24)
+        except Exception:
+            self.cell_font = ImageFont.load_default()
+
+        # Only '0' and '1' are ever drawn as cell text, so their sizes are cached
+        self._cell_text_sizes = {}
+
+    def _remove_frame_files(self):
+        """Delete the frames file this visualizer wrote, and frames_dir once it is empty."""
+        if self._frames_file is not None:
+            self._frames_file.close()
+            self._frames_file = None
+        path = self._frames_path()
+        if os.path.exists(path):
+            os.remove(path)
+        try:
+            os.rmdir(self.frames_dir)
+        except OSError:
+            pass
 
-    def create_board_image(self, board, constraints=None, current_pos=None, step_info=""):
+    def _render_background(self):
         img = Image.new('RGB', (self.image_width, self.image_height), 'white')
         draw = ImageDraw.Draw(img)
+        for row in range(self.board_size):
+            for col in range(self.board_size):
+                self._draw_cell(draw, row, col, self.colors[None])
+        return img
 
-        if step_info:
-            try:
-                title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 14)
-            except Exception:
-                title_font = ImageFont.load_default()
+    def _render_cell_tiles(self):
+        """Finished tiles (outline, fill and sprite) for every piece and highlight combination, keyed by (value, fill)."""
+        tiles = {}
+        combinations = [(-1, self.colors['highlight'])]
+        for piece_type in self._piece_sprites:
+            combinations += [(piece_type, self.colors[piece_type]), (piece_type, self.colors['highlight'])]
+
+        for cell_value, color in combinations:
+            img = self._background.copy()
+            x1, y1 = self._draw_cell(ImageDraw.Draw(img), 0, 0, color)
+            if cell_value >= 0:
+                self._draw_piece_template(img, cell_value, x1, y1)
+            tiles[(cell_value, color)] = img.crop((x1, y1, x1 + self.cell_size + 1, y1 + self.cell_size + 1))
+        return tiles
+
+    def _draw_cell(self, draw, row, col, color):
+        x1 = self._cell_xs[col]
+        y1 = self._cell_ys[row]
+        draw.rectangle([x1, y1, x1 + self.cell_size, y1 + self.cell_size],
+                       fill=color, outline=self.colors['grid'], width=2)
+        return x1, y1
+
+    def create_board_image(self, board, constraints=None, current_pos=None, step_info=""):
+        img = self._background.copy()
+        draw = ImageDraw.Draw(img)
 
+        if step_info:
+            title_font = self.title_font
             bbox = draw.textbbox((0, 0), step_info, font=title_font)
             text_width = bbox[2] - bbox[0]
             text_x = (self.image_width - text_width) // 2
@@ -76,23 +176,36 @@ class BoardVisualizer:
 
             draw.text((text_x, text_y), step_info, fill='black', font=title_font)
 
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                x1 = self.margin + col * self.cell_size
-                y1 = self.top_margin + row * self.cell_size
-                x2 = x1 + self.cell_size
-                y2 = y1 + self.cell_size
-
-                cell_value = board[row][col] if board[row] else None
+        # Lookups hoisted out of the per-cell loop; a numpy board is converted
+        # to nested lists once instead of indexed per cell
+        rows = board.tolist() if hasattr(board, 'tolist') else board
+        get_color = self.colors.get
+        default_color = self.colors[None]
+        highlight_color = self.colors['highlight']
+        cell_tiles = self._cell_tiles
+        xs, ys = self._cell_xs, self._cell_ys
+
+        for row, values in enumerate(rows):
+            for col, value in enumerate(values):
+                # Empty cells are stored as -1 (None on list boards) and are
+                # already drawn on the background
+                cell_value = -1 if value is None else int(value)
 
                 if (row, col) == current_pos:
-                    color = self.colors['highlight']
+                    color = highlight_color
+                elif cell_value >= 0:
+                    color = get_color(cell_value, default_color)
                 else:
-                    color = self.colors.get(cell_value, self.colors[None])
+                    continue
 
-                draw.rectangle([x1, y1, x2, y2], fill=color, outline=self.colors['grid'], width=2)
+                tile = cell_tiles.get((cell_value, color))
+                if tile is not None:
+                    img.paste(tile, (xs[col], ys[row]))
+                    continue
 
-                if cell_value is not None:
+                x1, y1 = self._draw_cell(draw, row, col, color)
+
+                if cell_value >= 0:
                     # Use template images if available, otherwise fallback to text
                     if cell_value in self.piece_templates:
                         self._draw_piece_template(img, cell_value, x1, y1)
@@ -101,18 +214,14 @@ class BoardVisualizer:
                         text_x = x1 + self.cell_size // 2
                         text_y = y1 + self.cell_size // 2
 
-                        try:
-                            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24)
-                        except Exception:
-                            font = ImageFont.load_default()
-
                         text = str(cell_value)
-                        bbox = draw.textbbox((0, 0), text, font=font)
-                        text_width = bbox[2] - bbox[0]
-                        text_height = bbox[3] - bbox[1]
+                        if text not in self._cell_text_sizes:
+                            bbox = draw.textbbox((0, 0), text, font=self.cell_font)
+                            self._cell_text_sizes[text] = (bbox[2] - bbox[0], bbox[3] - bbox[1])
+                        text_width, text_height = self._cell_text_sizes[text]
 
                         draw.text((text_x - text_width//2, text_y - text_height//2),
-                                 text, fill='white', font=font)
+                                 text, fill='white', font=self.cell_font)
 
         if constraints:
             self._draw_constraints(draw, constraints)
@@ -121,81 +230,137 @@ class BoardVisualizer:
 
     def _draw_piece_template(self, img, piece_type, x1, y1):
         """Draw piece using template image."""
-        template = self.piece_templates[piece_type]
-
-        # Calculate size to fit in cell with some padding
-        padding = 8
-        target_size = self.cell_size - 2 * padding
-
-        # Resize template to fit in cell
-        template_resized = template.resize((target_size, target_size), Image.Resampling.LANCZOS)
+        template_resized = self._piece_sprites[piece_type]
 
         # Calculate position to center the template in the cell
+        padding = 8
         paste_x = x1 + padding
         paste_y = y1 + padding
 
         # Paste the template onto the board image
         img.paste(template_resized, (paste_x, paste_y), template_resized)
 
-    def _draw_constraints(self, draw, constraints):
-        constraint_size = 8
+    def _marker_box(self, row, col, constraint_size):
+        x = self.margin + col * self.cell_size + self.cell_size // 2
+        y = self.top_margin + row * self.cell_size + self.cell_size // 2  # Offset by top margin
+        return [x - constraint_size, y - constraint_size, x + constraint_size, y + constraint_size]
 
+    def _draw_constraints(self, draw, constraints):
         for constraint_type, pos1, pos2 in constraints:
             r1, c1 = pos1
             r2, c2 = pos2
 
-            x1 = self.margin + c1 * self.cell_size + self.cell_size // 2
-            y1 = self.top_margin + r1 * self.cell_size + self.cell_size // 2  # Offset by top margin
-            x2 = self.margin + c2 * self.cell_size + self.cell_size // 2
-            y2 = self.top_margin + r2 * self.cell_size + self.cell_size // 2  # Offset by top margin
-
             color = self.colors['constraint_equal'] if constraint_type == '=' else self.colors['constraint_diff']
 
-            draw.ellipse([x1-constraint_size, y1-constraint_size, x1+constraint_size, y1+constraint_size],
-                        fill=color, outline='black', width=1)
-            draw.ellipse([x2-constraint_size, y2-constraint_size, x2+constraint_size, y2+constraint_size],
-                        fill=color, outline='black', width=1)
+            draw.ellipse(self._marker_boxes[r1][c1], fill=color, outline='black', width=1)
+            draw.ellipse(self._marker_boxes[r2][c2], fill=color, outline='black', width=1)
 
     def save_frame(self, board, constraints=None, current_pos=None, step_info=""):
         img = self.create_board_image(board, constraints, current_pos, step_info)
-        filename = f"frame_{self.step_counter:06d}.png"
-        filepath = os.path.join(self.frames_dir, filename)
-        img.save(filepath)
+
+        filepath = None
+        if self.low_memory:
+            # Every frame has the same size and mode, so raw bytes need no header
+            # and skip the PNG encode here and the decode in create_gif
+            filepath = self._frames_path()
+            if self._frames_file is None:
+                os.makedirs(self.frames_dir, exist_ok=True)
+                self._frames_file = open(filepath, 'wb')
+            self.frames.append(self._frames_file.tell())
+            self._frames_file.write(img.tobytes())
+        else:
+            self.frames.append(img)
+
         self.step_counter += 1
         return filepath
 
     def create_gif(self, output_path="solving_animation.gif", duration=200, cleanup_frames=True):
-        if not os.path.exists(self.frames_dir):
-            return None
-
-        frame_files = [f for f in os.listdir(self.frames_dir) if f.startswith("frame_") and f.endswith(".png")]
-        frame_files.sort()
-
-        if not frame_files:
-            return None
-
-        images = []
-        for frame_file in frame_files:
-            frame_path = os.path.join(self.frames_dir, frame_file)
-            img = Image.open(frame_path)
-            images.append(img)
-
-        if not images:
+        if not self.frames:
             return None
 
-        images[0].save(
+        frames_map = None
+        if self.low_memory:
+            # Map the frames file and build each frame from its slice only while
+            # the GIF is written
+            self._frames_file.flush()
+            with open(self._frames_path(), 'rb') as f:
+                frames_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            size = (self.image_width, self.image_height)
+            frame_bytes = self.image_width * self.image_height * 3
+
+            def load(offset):
+                return Image.frombytes('RGB', size, frames_map[offset:offset + frame_bytes])
+
+            first, last = load(self.frames[0]), load(self.frames[-1])
+            rest = _LazyFrames(load, self.frames[1:])
+        else:
+            first, last = self.frames[0], self.frames[-1]
+            rest = self.frames[1:]
+
+        # APNG and WebP keep full RGB color, so those frames are written as-is
+        extension = os.path.splitext(output_path)[1].lower()
+        if extension in ANIMATION_SAVE_OPTIONS:
+            first.save(
+                output_path,
+                save_all=True,
+                append_images=rest,
+                duration=duration,
+                loop=0,
+                **ANIMATION_SAVE_OPTIONS[extension]
+            )
+            return self._finish_animation(output_path, frames_map, cleanup_frames)
+
+        # Map every frame onto one palette instead of letting Pillow build a
+        # new adaptive palette per frame, which dominated the encoding time
+        palette = self._build_palette(first, last)
+        quantized = (img.quantize(palette=palette, dither=Image.Dither.NONE) for img in rest)
+
+        # Pillow's GIF writer already folds a frame identical to the previous one
+        # into its duration, so duplicates need no handling here
+        first.quantize(palette=palette, dither=Image.Dither.NONE).save(
             output_path,
             save_all=True,
-            append_images=images[1:],
+            append_images=quantized,
             duration=duration,
             loop=0
         )
 
+        return self._finish_animation(output_path, frames_map, cleanup_frames)
+
+    def _finish_animation(self, output_path, frames_map, cleanup_frames):
+        if frames_map is not None:
+            frames_map.close()
         if cleanup_frames:
-            shutil.rmtree(self.frames_dir)
+            if self.low_memory:
+                self._remove_frame_files()
+            self.frames = []
 
         return output_path
 
+    def _frames_path(self):
+        return os.path.join(self.frames_dir, "frames.rgb")
+
+    def _build_palette(self, first, last):
+        """Adaptive palette from the first and last frames plus each piece on every cell color."""
+        swatch_height = 2 * self.cell_size
+        sample = Image.new('RGB', (self.image_width, 2 * self.image_height + swatch_height), 'white')
+        sample.paste(first.convert('RGB'), (0, 0))
+        sample.paste(last.convert('RGB'), (0, self.image_height))
+
+        draw = ImageDraw.Draw(sample)
+        backgrounds = [self.colors[0], self.colors[1], self.colors[None], self.colors['highlight']]
+        for i, background in enumerate(backgrounds):
+            for piece_type in (0, 1):
+                x1 = i * self.cell_size
+                y1 = 2 * self.image_height + piece_type * self.cell_size
+                draw.rectangle([x1, y1, x1 + self.cell_size, y1 + self.cell_size], fill=background)
+                if piece_type in self._piece_sprites:
+                    self._draw_piece_template(sample, piece_type, x1, y1)
+
+        return sample.quantize(colors=256)
+
     def reset(self):
+        if self.low_memory:
+            self._remove_frame_files()
         self.step_counter = 0
-        self._setup_frames_dir()
+        self.frames = []
@@ -41,11 +41,9 @@ def test_constraint_classifier_robustness():
 
         # Test with diagonal symbol (should be 'x')
         diagonal_img = np.ones((40, 40, 3), dtype=np.uint8) * 255
-        for i in range(20):
-            if 10+i < 40 and 10+i < 40:
-                diagonal_img[10+i, 10+i] = [140, 114, 76]  # Diagonal \
-            if 10+i < 40 and 30-i >= 0:
-                diagonal_img[10+i, 30-i] = [140, 114, 76]  # Diagonal /
+        i = np.arange(20)
+        diagonal_img[10 + i, 10 + i] = [140, 114, 76]  # Diagonal \
+        diagonal_img[10 + i, 30 - i] = [140, 114, 76]  # Diagonal /
         result = classifier.classify_constraint(diagonal_img)
         assert result == 'not_equals'
 
@@ -57,7 +55,8 @@ def test_constraint_classifier_robustness():
         return False
 
 
-if __name__ == "__main__":
+def run(image_path=None, create_gif=False):
+    """Run the constraint classifier tests; the entry point the test runner calls in-process."""
     print("🎯 CONSTRAINT CLASSIFIER TESTS")
     print("=" * 50)
 
@@ -66,4 +65,8 @@ if __name__ == "__main__":
 
     print(f"\n📊 Results: {'PASSED' if success else 'FAILED'}")
 
-    sys.exit(0 if success else 1)
+    return success
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run() else 1)
@@ -1,19 +1,40 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 from pathlib import Path
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from template_constraint_classifier import TemplateConstraintClassifier
-from image_parser import TangoImageParser
+from image_parser import TangoImageParser, load_image
+
+DEBUG_TILE_SIZE = 240
+DEBUG_LABEL_HEIGHT = 30
+
+
+def _debug_tile(image, label):
+    """Scale an RGB or grayscale patch into a fixed-size labelled RGB tile."""
+    tile = np.full((DEBUG_LABEL_HEIGHT + DEBUG_TILE_SIZE, DEBUG_TILE_SIZE, 3), 255, dtype=np.uint8)
+    cv2.putText(tile, label, (5, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 0, 0), 1, cv2.LINE_AA)
+
+    if image is not None:
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+        scale = (DEBUG_TILE_SIZE - 10) / max(image.shape[:2])
+        scaled = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_NEAREST)
+        h, w = scaled.shape[:2]
+        y = DEBUG_LABEL_HEIGHT + (DEBUG_TILE_SIZE - h) // 2
+        x = (DEBUG_TILE_SIZE - w) // 2
+        tile[y:y + h, x:x + w] = scaled
+
+    return tile
+
 
 def debug_constraint_detection(image_path: str, save_debug: bool = True):
     print(f"🔍 Debugging constraint detection for: {image_path}")
 
     parser = TangoImageParser()
-    img = cv2.imread(image_path)
+    img = load_image(image_path)
     if img is None:
         print(f"❌ Could not load image: {image_path}")
         return
@@ -26,6 +47,10 @@ def debug_constraint_detection(image_path: str, save_debug: bool = True):
     height, width = img_rgb.shape[:2]
     constraint_regions = []
 
+    # Constraint-colored pixels of the whole image in one pass (squared distance < 30^2)
+    color_diff = img_rgb.astype(np.int32) - np.array([140, 114, 76], dtype=np.int32)
+    constraint_mask = np.einsum('ijk,ijk->ij', color_diff, color_diff) < 30 * 30
+
     for row in range(6):
         for col in range(5):
             x1, y1, w1, h1 = grid_coords[row][col]
@@ -37,16 +62,14 @@ def debug_constraint_detection(image_path: str, save_debug: bool = True):
 
             if border_x >= 0 and border_x + border_w < width:
                 border_img = img_rgb[border_y:border_y+border_h, border_x:border_x+border_w]
-
-                target_color = np.array([140, 114, 76])
-                color_diff = np.sqrt(np.sum((border_img - target_color) ** 2, axis=2))
-                constraint_pixels = np.sum(color_diff < 30)
+                border_mask = constraint_mask[border_y:border_y+border_h, border_x:border_x+border_w]
+                constraint_pixels = np.count_nonzero(border_mask)
 
                 if constraint_pixels > 8:
                     print(f"🎯 Found horizontal constraint candidate at ({row},{col})-({row},{col+1})")
                     constraint_regions.append({
                         'image': border_img,
-                        'mask': (color_diff < 30).astype(np.uint8) * 255,
+                        'mask': border_mask.astype(np.uint8) * 255,
                         'position': f"({row},{col})-({row},{col+1})",
                         'orientation': 'horizontal',
                         'is_horizontal': True
@@ -63,16 +86,14 @@ def debug_constraint_detection(image_path: str, save_debug: bool = True):
 
             if border_y >= 0 and border_y + border_h < height:
                 border_img = img_rgb[border_y:border_y+border_h, border_x:border_x+border_w]
-
-                target_color = np.array([140, 114, 76])
-                color_diff = np.sqrt(np.sum((border_img - target_color) ** 2, axis=2))
-                constraint_pixels = np.sum(color_diff < 30)
+                border_mask = constraint_mask[border_y:border_y+border_h, border_x:border_x+border_w]
+                constraint_pixels = np.count_nonzero(border_mask)
 
                 if constraint_pixels > 8:
                     print(f"🎯 Found vertical constraint candidate at ({row},{col})-({row+1},{col})")
                     constraint_regions.append({
                         'image': border_img,
-                        'mask': (color_diff < 30).astype(np.uint8) * 255,
+                        'mask': border_mask.astype(np.uint8) * 255,
                         'position': f"({row},{col})-({row+1},{col})",
                         'orientation': 'vertical',
                         'is_horizontal': False
@@ -87,22 +108,10 @@ def debug_constraint_detection(image_path: str, save_debug: bool = True):
     classifier = TemplateConstraintClassifier()
 
     if save_debug:
-        num_regions = len(constraint_regions)
-        fig, axes = plt.subplots(num_regions, 4, figsize=(16, 4*num_regions))
-        if num_regions == 1:
-            axes = axes.reshape(1, -1)
-
-        for i, region in enumerate(constraint_regions):
+        rows = []
+        for region in constraint_regions:
             print(f"\n🔍 Analyzing {region['orientation']} constraint at {region['position']}")
 
-            axes[i, 0].imshow(region['image'])
-            axes[i, 0].set_title(f"Original\n{region['position']}")
-            axes[i, 0].axis('off')
-
-            axes[i, 1].imshow(region['mask'], cmap='gray')
-            axes[i, 1].set_title(f"Mask\n{region['orientation']}")
-            axes[i, 1].axis('off')
-
             result = classifier.classify_constraint(region['mask'], region['is_horizontal'])
             print(f"   Template result: {result}")
 
@@ -112,25 +121,22 @@ def debug_constraint_detection(image_path: str, save_debug: bool = True):
                 gray_image = region['image'].copy()
             processed = classifier._preprocess_image(gray_image)
 
-            axes[i, 2].imshow(processed, cmap='gray')
-            axes[i, 2].set_title(f"Processed\nResult: {result}")
-            axes[i, 2].axis('off')
-
             template_key = f"{'eq' if result == 'equals' else 'x'}_{'horizontal' if region['is_horizontal'] else 'vertical'}"
             if template_key in classifier.templates:
                 template = classifier.templates[template_key]
-                template_processed = classifier._preprocess_image(template)
-                axes[i, 3].imshow(template_processed, cmap='gray')
-                axes[i, 3].set_title(f"Template\n{template_key}")
+                template_tile = _debug_tile(classifier._preprocess_image(template), f"Template {template_key}")
             else:
-                axes[i, 3].text(0.5, 0.5, 'No template', ha='center', va='center')
-                axes[i, 3].set_title("No template")
-            axes[i, 3].axis('off')
+                template_tile = _debug_tile(None, "No template")
 
-        plt.tight_layout()
+            rows.append(np.hstack([
+                _debug_tile(region['image'], f"Original {region['position']}"),
+                _debug_tile(region['mask'], f"Mask {region['orientation']}"),
+                _debug_tile(processed, f"Processed: {result}"),
+                template_tile,
+            ]))
 
         debug_path = "constraint_debug.png"
-        plt.savefig(debug_path, dpi=150, bbox_inches='tight')
+        cv2.imwrite(debug_path, cv2.cvtColor(np.vstack(rows), cv2.COLOR_RGB2BGR))
         print(f"💾 Debug visualization saved to: {debug_path}")
 
     else:
@@ -145,6 +151,14 @@ def test_all_samples():
         print(f"\n{'='*50}")
         debug_constraint_detection(str(sample_file), save_debug=False)
 
+def run(image_path=None, create_gif=False):
+    """Debug one image, or every sample without an image; the test runner's entry point."""
+    if image_path:
+        debug_constraint_detection(image_path)
+    else:
+        test_all_samples()
+    return True
+
 if __name__ == "__main__":
     if len(sys.argv) == 1:
         test_all_samples()
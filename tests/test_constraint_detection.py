@@ -76,6 +76,19 @@ def test_constraint_detection_structure(image_path):
         return False
 
 
+def run(image_path=None, create_gif=False):
+    """Run the constraint detection tests; the entry point the test runner calls in-process."""
+    print("🎯 CONSTRAINT DETECTION TESTS")
+    print("=" * 50)
+
+    # Run test
+    success = test_constraint_detection_structure(image_path)
+
+    print(f"\n📊 Results: {'PASSED' if success else 'FAILED'}")
+
+    return success
+
+
 if __name__ == "__main__":
     import sys
 
@@ -89,12 +102,4 @@ if __name__ == "__main__":
             print("Usage: python3 -m tests.test_constraint_detection [image_path]")
             sys.exit(1)
 
-    print("🎯 CONSTRAINT DETECTION TESTS")
-    print("=" * 50)
-
-    # Run test
-    success = test_constraint_detection_structure(image_path)
-
-    print(f"\n📊 Results: {'PASSED' if success else 'FAILED'}")
-
-    sys.exit(0 if success else 1)
+    sys.exit(0 if run(image_path) else 1)
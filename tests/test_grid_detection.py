@@ -4,7 +4,7 @@ import cv2
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from image_parser import TangoImageParser
+from image_parser import TangoImageParser, load_image
 
 
 def test_grid_detection(image_path):
@@ -16,7 +16,7 @@ def test_grid_detection(image_path):
 
     try:
         parser = TangoImageParser()
-        img = cv2.imread(image_path)
+        img = load_image(image_path)
         img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
 
         # Use grid detector
@@ -55,6 +55,19 @@ def test_grid_detection(image_path):
         return False
 
 
+def run(image_path=None, create_gif=False):
+    """Run the grid detection tests; the entry point the test runner calls in-process."""
+    print("🎯 GRID DETECTION TESTS")
+    print("=" * 50)
+
+    # Run test
+    success = test_grid_detection(image_path)
+
+    print(f"\n📊 Results: {'PASSED' if success else 'FAILED'}")
+
+    return success
+
+
 if __name__ == "__main__":
     import sys
 
@@ -68,12 +81,4 @@ if __name__ == "__main__":
             print("Usage: python3 -m tests.test_grid_detection [image_path]")
             sys.exit(1)
 
-    print("🎯 GRID DETECTION TESTS")
-    print("=" * 50)
-
-    # Run test
-    success = test_grid_detection(image_path)
-
-    print(f"\n📊 Results: {'PASSED' if success else 'FAILED'}")
-
-    sys.exit(0 if success else 1)
+    sys.exit(0 if run(image_path) else 1)
@@ -1,11 +1,10 @@
 import sys
 import os
 from pathlib import Path
-import cv2
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from image_parser import TangoImageParser
+from image_parser import TangoImageParser, load_image
 
 
 def test_image_loading_and_parsing(image_path):
@@ -21,7 +20,7 @@ def test_image_loading_and_parsing(image_path):
 
     try:
         # Verify OpenCV can load the image
-        img = cv2.imread(image_path)
+        img = load_image(image_path)
         if img is None:
             print("❌ OpenCV could not load image")
             return False
@@ -88,19 +87,8 @@ def test_edge_cases_and_robustness(image_path):
         return False
 
 
-if __name__ == "__main__":
-    import sys
-
-    # Determine image to use
-    if len(sys.argv) > 1:
-        image_path = sys.argv[1]
-    else:
-        image_path = None
-        if not image_path:
-            print("❌ No image found. Please provide image path as argument.")
-            print("Usage: python3 -m tests.test_image_parser [image_path]")
-            sys.exit(1)
-
+def run(image_path=None, create_gif=False):
+    """Run the image parser tests; the entry point the test runner calls in-process."""
     print("🎯 IMAGE PARSER TESTS")
     print("=" * 50)
 
@@ -124,4 +112,20 @@ if __name__ == "__main__":
     success = passed == total
     print("✅ All tests passed!" if success else "❌ Some tests failed")
 
-    sys.exit(0 if success else 1)
+    return success
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Determine image to use
+    if len(sys.argv) > 1:
+        image_path = sys.argv[1]
+    else:
+        image_path = None
+        if not image_path:
+            print("❌ No image found. Please provide image path as argument.")
+            print("Usage: python3 -m tests.test_image_parser [image_path]")
+            sys.exit(1)
+
+    sys.exit(0 if run(image_path) else 1)
@@ -1,38 +1,206 @@
 import sys
 import os
+import io
+import json
+import hashlib
+import importlib
+import traceback
+from contextlib import redirect_stdout, redirect_stderr
 from pathlib import Path
 import time
-import subprocess
+import argparse
+from multiprocessing import Pool, TimeoutError
+
+tests_dir = Path(__file__).resolve().parent
+project_root = tests_dir.parent
 
 # Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(project_root / "src"))
 
-img_dir = Path(__file__).parent / "img"
+img_dir = tests_dir / "img"
 if not img_dir.exists():
     img_dir.mkdir(parents=True, exist_ok=True)
 
+# Test files given the image path, and those given the GIF flag
+IMAGE_TESTS = frozenset({
+    "test_image_parser.py", "test_grid_detection.py", "test_piece_detection.py",
+    "test_constraint_detection.py", "test_solver_integration.py", "test_visual_debug.py",
+})
+GIF_TESTS = frozenset({"test_solver_integration.py"})
+
+# Passing results of side-effect-free suites, keyed by a hash of their inputs
+results_cache_dir = project_root / ".tests_cache"
+
+def _test_arguments(test_file, image_path=None, create_gif=False):
+    """
+    The image path and GIF flag a test file is given: the image only goes to
+    the tests that take one, and the GIF flag only to the solver tests.
+    """
+    name = Path(test_file).name
+    if name not in IMAGE_TESTS:
+        image_path = None
+    return image_path, create_gif and name in GIF_TESTS
+
+
 def run_test_file(test_file, image_path=None, create_gif=False):
     """
-    Run a test file and return (success, output).
+    Import a test file and call its run() in this process, from the project
+    root as a subprocess would be. Returns (success, stdout, stderr).
     """
+    image_path, create_gif = _test_arguments(test_file, image_path, create_gif)
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    original_dir = os.getcwd()
+    try:
+        if str(Path(test_file).parent) not in sys.path:
+            sys.path.insert(0, str(Path(test_file).parent))
+        os.chdir(project_root)
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            module = importlib.import_module(Path(test_file).stem)
+            success = bool(module.run(image_path, create_gif))
+    except (Exception, SystemExit):
+        success = False
+        stderr.write(traceback.format_exc())
+    finally:
+        os.chdir(original_dir)
+    return success, stdout.getvalue(), stderr.getvalue()
+
+
+def _preimport():
+    """Pool initializer: each worker pays the heavy imports once, not per test."""
+    import cv2  # noqa: F401
+    import numpy  # noqa: F401
+    import image_parser  # noqa: F401
+    import tango_solver  # noqa: F401
+
+
+def _run_pooled_test(job):
+    test_name, test_file, image_path, create_gif = job
+    return test_name, run_test_file(test_file, image_path, create_gif)
+
+
+def _result_cache_path(test_file, image_path=None, create_gif=False):
+    """
+    Cache file for a test run: a hash of main.py, every test and source file,
+    the templates, the image it is given, its arguments and the Python and
+    library versions. None when an input cannot be read.
+    """
+    import cv2
+    import numpy
+    import PIL
+
+    image_path, create_gif = _test_arguments(test_file, image_path, create_gif)
+
+    inputs = [project_root / "main.py"]
+    inputs += sorted(tests_dir.glob("*.py"))
+    inputs += sorted((project_root / "src").glob("*.py"))
+    inputs += sorted((project_root / "templates").glob("*.png"))
+    if image_path:
+        # Tests run from the project root, so relative image paths start there
+        inputs.append(project_root / image_path)
+
+    versions = (sys.version, numpy.__version__, cv2.__version__, PIL.__version__)
+    digest = hashlib.blake2b(repr((Path(test_file).name, image_path, create_gif, versions)).encode())
     try:
-        cmd = [sys.executable, test_file]
-        if image_path and ("image_parser" in test_file or "grid_detection" in test_file or
-                          "piece_detection" in test_file or "constraint_detection" in test_file or
-                          "solver_integration" in test_file or "visual_debug" in test_file):
-            cmd.append(image_path)
+        for path in inputs:
+            digest.update(path.read_bytes())
+    except OSError:
+        return None
+    return results_cache_dir / f"{digest.hexdigest()}.json"
+
+
+def _load_cached_result(cache_path):
+    if cache_path is None or not cache_path.exists():
+        return None
+    with open(cache_path) as f:
+        cached = json.load(f)
+    return cached["ok"], cached["stdout"], cached["stderr"]
+
 
-        if create_gif and "solver_integration" in test_file:
-            cmd.append("--gif")
+def _store_result(cache_path, success, stdout, stderr):
+    # Only passes are kept, so a failure is always rerun
+    if cache_path is None or not success:
+        return
+    results_cache_dir.mkdir(exist_ok=True)
+    with open(cache_path, "w") as f:
+        json.dump({"ok": success, "stdout": stdout, "stderr": stderr}, f)
 
-        project_root = Path(__file__).parent.parent
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=project_root)
-        return result.returncode == 0, result.stdout, result.stderr
-    except Exception as e:
-        return False, "", str(e)
+
+def _report_result(test_name, success, stderr):
+    if success:
+        print(f"✅ {test_name}: PASSED")
+    else:
+        print(f"❌ {test_name}: FAILED")
+        if stderr:
+            print(f"   Error: {stderr.strip()}")
+    return test_name, success, stderr if stderr else ""
 
 
-def run_all_tests(image_path=None, include_visual=False, create_gif=False):
+def run_test_group(tests, image_path=None, create_gif=False, workers=None, use_cache=False, timeout=None):
+    """
+    Run test files and return their results in the given order.
+
+    Without workers or a timeout the tests run in this interpreter, so the
+    imports are paid once but the tests run one at a time. Otherwise they run
+    in a pool of `workers` (one when only a timeout is given) worker processes
+    that import the heavy modules up front, and lines are printed as tests
+    finish; if no test finishes for `timeout` seconds, the remaining ones fail
+    and the pool is terminated. With use_cache, a test whose inputs are
+    unchanged since it last passed is not run again.
+    """
+    results = {}
+    jobs = []
+    for test_name, test_file in tests:
+        test_path = tests_dir / test_file
+        if not test_path.exists():
+            print(f"❌ Test file not found: {test_file}")
+            results[test_name] = (test_name, False, f"File not found: {test_file}")
+            continue
+
+        cache_path = _result_cache_path(str(test_path), image_path, create_gif) if use_cache else None
+        cached = _load_cached_result(cache_path)
+        if cached is not None:
+            print(f"♻️  {test_name}: inputs unchanged since last run")
+            results[test_name] = _report_result(test_name, cached[0], cached[2])
+            print()
+            continue
+        jobs.append((test_name, test_path, cache_path))
+
+    # A hung test can only be stopped in a worker process
+    if not workers and timeout is not None:
+        workers = 1
+
+    if not workers:
+        for test_name, test_path, cache_path in jobs:
+            print(f"🔄 Running {test_name} tests...")
+            success, stdout, stderr = run_test_file(str(test_path), image_path, create_gif)
+            _store_result(cache_path, success, stdout, stderr)
+            results[test_name] = _report_result(test_name, success, stderr)
+            print()
+    elif jobs:
+        for test_name, _, _ in jobs:
+            print(f"🔄 Running {test_name} tests...")
+        print()
+        cache_paths = {test_name: cache_path for test_name, _, cache_path in jobs}
+        with Pool(processes=min(len(jobs), workers), initializer=_preimport) as pool:
+            outcomes = pool.imap_unordered(_run_pooled_test, [(test_name, str(test_path), image_path, create_gif)
+                                                              for test_name, test_path, _ in jobs])
+            try:
+                for _ in jobs:
+                    test_name, (success, stdout, stderr) = outcomes.next(timeout=timeout)
+                    _store_result(cache_paths[test_name], success, stdout, stderr)
+                    results[test_name] = _report_result(test_name, success, stderr)
+            except TimeoutError:
+                # Leaving the with block terminates the workers still running
+                for test_name, _, _ in jobs:
+                    if test_name not in results:
+                        results[test_name] = _report_result(test_name, False, f"Timed out after {timeout} s")
+        print()
+
+    return [results[test_name] for test_name, _ in tests]
+
+
+def run_all_tests(image_path=None, include_visual=False, create_gif=False, workers=None, use_cache=False, timeout=None):
     """
     Run all test suites and generate comprehensive report.
     """
@@ -64,68 +232,31 @@ def run_all_tests(image_path=None, include_visual=False, create_gif=False):
     print("📋 Running standard tests...")
     print()
 
-    for test_name, test_file in test_files:
-        print(f"🔄 Running {test_name} tests...")
-
-        test_path = Path(__file__).parent / test_file
-        if not test_path.exists():
-            print(f"❌ Test file not found: {test_file}")
-            results.append((test_name, False, f"File not found: {test_file}"))
-            continue
-
-        success, stdout, stderr = run_test_file(str(test_path), image_path, create_gif)
-
-        if success:
-            print(f"✅ {test_name}: PASSED")
-        else:
-            print(f"❌ {test_name}: FAILED")
-            if stderr:
-                print(f"   Error: {stderr.strip()}")
-
-        results.append((test_name, success, stderr if stderr else ""))
-        print()
+    # GIF runs write an animation, so only plain runs can reuse earlier results
+    results.extend(run_test_group(test_files, image_path, create_gif, workers,
+                                  use_cache=use_cache and not create_gif, timeout=timeout))
 
     # Run visual tests if requested
     if include_visual and image_path:
         print("🎨 Running visual debugging tests...")
         print()
 
-        for test_name, test_file in visual_tests:
-            print(f"🔄 Running {test_name} tests...")
-
-            test_path = Path(__file__).parent / test_file
-            if not test_path.exists():
-                print(f"❌ Test file not found: {test_file}")
-                results.append((test_name, False, f"File not found: {test_file}"))
-                continue
-
-            success, stdout, stderr = run_test_file(str(test_path), image_path, create_gif)
-
-            if success:
-                print(f"✅ {test_name}: PASSED")
-            else:
-                print(f"❌ {test_name}: FAILED")
-                if stderr:
-                    print(f"   Error: {stderr.strip()}")
-
-            results.append((test_name, success, stderr if stderr else ""))
-            print()
+        results.extend(run_test_group(visual_tests, image_path, create_gif, workers, timeout=timeout))
 
         # Run constraint debug specifically with visual output
         print("🔍 Running constraint detection debug with visual output...")
         try:
             # Import and run the constraint debug function directly
-            sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-            sys.path.insert(0, str(Path(__file__).parent))
+            sys.path.insert(0, str(project_root / "src"))
+            sys.path.insert(0, str(tests_dir))
             from test_constraint_debug import debug_constraint_detection
 
             # Save to tests/img/ directory
-            img_dir = Path(__file__).parent / "img"
             img_dir.mkdir(exist_ok=True)
 
             # Convert relative path to absolute path from the main directory
             if not Path(image_path).is_absolute():
-                image_path = str(Path(__file__).parent.parent / image_path)
+                image_path = str(project_root / image_path)
 
             # Change to the output directory temporarily
             original_dir = os.getcwd()
@@ -167,36 +298,37 @@ def run_all_tests(image_path=None, include_visual=False, create_gif=False):
         if error and not success:
             print(f"             Error: {error.strip()}")
 
+    return all(success for _, success, _ in results)
 
 
 if __name__ == "__main__":
-
-    if "--help" in sys.argv:
-        print("Usage: python3 -m tests.test_runner [image_path] [--visual] [--gif]")
-        print("  --visual: Include visual debugging tests (generates PNG files)")
-        print("  --gif: Create GIF animation for solver tests")
-        sys.exit(0)
-
-    include_visual = "--visual" in sys.argv
-    create_gif = "--gif" in sys.argv
-
-    if include_visual:
-        sys.argv.remove("--visual")
-    if create_gif:
-        sys.argv.remove("--gif")
-
-    # Determine image to use
-    if len(sys.argv) > 1:
-        image_path = sys.argv[1]
-    else:
-        image_path = None
-        if not image_path:
-            print("❌ No image found. Please provide image path as argument.")
-            print("Usage: python3 -m tests.test_runner [image_path] [--visual] [--gif]")
-            print("  --visual: Include visual debugging tests (generates PNG files)")
-            print("  --gif: Create GIF animation for solver tests")
-            sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Run the Tango solver test suites on a puzzle image",
+        prog="python3 -m tests.test_runner"
+    )
+    parser.add_argument("image", nargs="?", help="Path to puzzle image")
+    parser.add_argument("--visual", action="store_true",
+                        help="Include visual debugging tests (generates PNG files)")
+    parser.add_argument("--gif", action="store_true", help="Create GIF animation for solver tests")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Run the tests concurrently in one worker process per CPU")
+    parser.add_argument("--jobs", type=int,
+                        help="Run the tests concurrently in this many worker processes")
+    parser.add_argument("--timeout", type=float,
+                        help="Fail the remaining tests when none finishes within this many seconds; "
+                             "tests then run in worker processes (default: no timeout)")
+    parser.add_argument("--cache", action="store_true",
+                        help="Skip tests whose inputs are unchanged since they last passed")
+
+    args = parser.parse_args()
+
+    if not args.image:
+        print("❌ No image found. Please provide image path as argument.")
+        parser.print_usage()
+        sys.exit(1)
+
+    workers = args.jobs or ((os.cpu_count() or 1) if args.parallel else None)
 
     # Run all tests
-    success = run_all_tests(image_path, include_visual, create_gif)
+    success = run_all_tests(args.image, args.visual, args.gif, workers, args.cache, args.timeout)
     sys.exit(0 if success else 1)
@@ -1,11 +1,13 @@
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 import cv2
 import numpy as np
 from PIL import Image
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-from image_parser import TangoImageParser
+from image_parser import TangoImageParser, load_image
 from tango_solver import TangoSolver
 
 img_dir = Path(__file__).parent / "img"
@@ -13,8 +15,16 @@ if not img_dir.exists():
     img_dir.mkdir(parents=True, exist_ok=True)
 
 
+# Composited piece sprites by (template id, size), see piece_sprite
+_piece_sprites = {}
+
+# Half the side of the tile a constraint symbol is first drawn in, with room to spare
+SYMBOL_SPRITE_HALF = 32
+
+
+@lru_cache(maxsize=None)
 def load_piece_templates():
-    """Load moon and sun templates from templates directory."""
+    """Load moon and sun templates from templates directory, once per process."""
     templates_dir = Path(__file__).parent.parent / "templates"
     piece_templates = {}
 
@@ -40,36 +50,43 @@ def load_piece_templates():
     return piece_templates
 
 
+def piece_sprite(template, size):
+    """
+    The template resized to size x size and composited onto white, built once
+    per template and size instead of on every draw.
+    """
+    key = (id(template), size)
+    if key not in _piece_sprites:
+        resized = cv2.resize(template, (size, size), interpolation=cv2.INTER_AREA)
+        if resized.shape[2] == 4:
+            alpha = resized[:, :, 3:] / 255.0  # Normalizar alfa a [0,1]
+            # Fondo blanco
+            sprite = (resized[:, :, :3] * alpha + 255 * (1 - alpha)).astype(np.uint8)
+        else:
+            sprite = resized[:, :, :3]
+        # The template is kept alongside its sprite so its id cannot be reused
+        _piece_sprites[key] = (template, sprite)
+    return _piece_sprites[key][1]
+
+
+@lru_cache(maxsize=128)
+def _text_size(text, font_scale, thickness):
+    """Width and height of text in FONT_HERSHEY_SIMPLEX; the labels repeat across cells."""
+    return cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)[0]
+
+
 def draw_piece_with_template(vis_img, center_x, center_y, piece_type, templates, size=60):
     """Draw a piece using template image or fallback to circle."""
     if piece_type in templates:
-        template = templates[piece_type]
-        if template.shape[2] == 4:
-            template_resized = cv2.resize(template, (size, size), interpolation=cv2.INTER_AREA)
-            rgb = template_resized[:, :, :3]
-            alpha = template_resized[:, :, 3] / 255.0  # Normalizar alfa a [0,1]
-            x_start = center_x - size // 2
-            y_start = center_y - size // 2
-            x_end = x_start + size
-            y_end = y_start + size
-            if (x_start >= 0 and y_start >= 0 and x_end <= vis_img.shape[1] and y_end <= vis_img.shape[0]):
-                roi = vis_img[y_start:y_end, x_start:x_end].copy()
-                # Fondo blanco
-                for c in range(3):
-                    roi[:, :, c] = (rgb[:, :, c] * alpha + 255 * (1 - alpha)).astype(np.uint8)
-                vis_img[y_start:y_end, x_start:x_end] = roi
-            else:
-                draw_piece_fallback(vis_img, center_x, center_y, piece_type, size)
+        sprite = piece_sprite(templates[piece_type], size)
+        x_start = center_x - size // 2
+        y_start = center_y - size // 2
+        x_end = x_start + size
+        y_end = y_start + size
+        if (x_start >= 0 and y_start >= 0 and x_end <= vis_img.shape[1] and y_end <= vis_img.shape[0]):
+            vis_img[y_start:y_end, x_start:x_end] = sprite
         else:
-            template_resized = cv2.resize(template, (size, size), interpolation=cv2.INTER_AREA)
-            x_start = center_x - size // 2
-            y_start = center_y - size // 2
-            x_end = x_start + size
-            y_end = y_start + size
-            if (x_start >= 0 and y_start >= 0 and x_end <= vis_img.shape[1] and y_end <= vis_img.shape[0]):
-                vis_img[y_start:y_end, x_start:x_end] = template_resized[:, :, :3]
-            else:
-                draw_piece_fallback(vis_img, center_x, center_y, piece_type, size)
+            draw_piece_fallback(vis_img, center_x, center_y, piece_type, size)
     else:
         draw_piece_fallback(vis_img, center_x, center_y, piece_type, size)
 
@@ -91,7 +108,110 @@ def draw_piece_fallback(vis_img, center_x, center_y, piece_type, size=60):
                    cv2.FONT_HERSHEY_DUPLEX, font_scale*1.2, (0, 0, 0), max(2, int(size/20)))
 
 
-def draw_grid_detection_visualization(image_path, output_path=None):
+def draw_cell_grid(vis_img, cell_size, cell_colors):
+    """
+    Fill each cell of the 6x6 grid with its color from cell_colors (6, 6, 3) and
+    draw the 2 px cell borders, pixel for pixel as a filled cv2.rectangle inset
+    by 2 px plus a cv2.rectangle border per cell would, using slice writes.
+    """
+    grid_size = 6 * cell_size
+    vis_img[:grid_size, :grid_size] = np.repeat(np.repeat(cell_colors, cell_size, axis=0), cell_size, axis=1)
+
+    # A 2 px cv2 line at p covers p-1..p+1
+    for i in range(7):
+        p = i * cell_size
+        vis_img[max(p - 1, 0):p + 2, :grid_size + 1] = (100, 100, 100)
+        vis_img[:grid_size + 1, max(p - 1, 0):p + 2] = (100, 100, 100)
+
+
+def draw_constraint_symbol(vis_img, center_x, center_y, constraint_type):
+    """Draw the constraint symbol in a white disk with a black ring."""
+    cv2.circle(vis_img, (center_x, center_y), 20, (255, 255, 255), -1)
+    cv2.circle(vis_img, (center_x, center_y), 20, (0, 0, 0), 3)
+
+    if constraint_type == "=":
+        # Adjust the center for "="
+        offset_x, offset_y = -15, 11
+    elif constraint_type == "x":
+        # Adjust the center for "x"
+        offset_x, offset_y = -10, 9
+    else:
+        offset_x, offset_y = -10, 10
+    cv2.putText(vis_img, constraint_type, (center_x + offset_x, center_y + offset_y),
+                cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 3)
+
+
+@lru_cache(maxsize=None)
+def constraint_symbol_sprite(constraint_type):
+    """
+    Draw the constraint symbol once and crop it to the pixels it covers.
+
+    Returns the tile, its mask and the offset of its top-left corner from the
+    symbol center. The disk is opaque, so copying the masked pixels matches
+    drawing the symbol in place.
+    """
+    size = 2 * SYMBOL_SPRITE_HALF + 1
+    on_black = np.zeros((size, size, 3), dtype=np.uint8)
+    on_white = np.full((size, size, 3), 255, dtype=np.uint8)
+    for tile in (on_black, on_white):
+        draw_constraint_symbol(tile, SYMBOL_SPRITE_HALF, SYMBOL_SPRITE_HALF, constraint_type)
+
+    covered = (on_black == on_white).all(axis=2)
+    rows, cols = np.nonzero(covered)
+    top, bottom, left, right = rows.min(), rows.max() + 1, cols.min(), cols.max() + 1
+    tile = on_black[top:bottom, left:right].copy()
+    mask = np.repeat(covered[top:bottom, left:right, None], 3, axis=2)
+    return tile, mask, int(top) - SYMBOL_SPRITE_HALF, int(left) - SYMBOL_SPRITE_HALF
+
+
+def draw_constraint_connections(vis_img, constraints, cell_size):
+    """Draw each constraint as a line between the cell centers with its symbol at the midpoint."""
+    half_cell = cell_size // 2
+    for constraint in constraints:
+        pos1, pos2 = constraint['pos1'], constraint['pos2']
+        constraint_type = constraint['type']
+
+        x1 = pos1[1] * cell_size + half_cell
+        y1 = pos1[0] * cell_size + half_cell
+        x2 = pos2[1] * cell_size + half_cell
+        y2 = pos2[0] * cell_size + half_cell
+
+        # Draw connection line
+        color = (0, 100, 255) if constraint_type == '=' else (255, 0, 100)
+        cv2.line(vis_img, (x1, y1), (x2, y2), color, 6)
+
+        # Draw constraint symbol at midpoint
+        mid_x = (x1 + x2) // 2
+        mid_y = (y1 + y2) // 2
+
+        sprite, mask, offset_y, offset_x = constraint_symbol_sprite(constraint_type)
+        top, left = mid_y + offset_y, mid_x + offset_x
+        bottom, right = top + sprite.shape[0], left + sprite.shape[1]
+        if top >= 0 and left >= 0 and bottom <= vis_img.shape[0] and right <= vis_img.shape[1]:
+            np.copyto(vis_img[top:bottom, left:right], sprite, where=mask)
+        else:
+            draw_constraint_symbol(vis_img, mid_x, mid_y, constraint_type)
+
+
+def build_constraint_map(constraints):
+    """Map each constrained cell to the types of the constraints touching it."""
+    constraint_map = {}
+    for constraint in constraints:
+        constraint_type = constraint['type']
+        for pos in (constraint['pos1'], constraint['pos2']):
+            constraint_map.setdefault(pos, []).append(constraint_type)
+    return constraint_map
+
+
+def save_image(output_path, img, writer=None):
+    """Write img as output_path, on the writer executor when one is given."""
+    if writer is None:
+        return cv2.imwrite(output_path, img)
+    return writer.submit(cv2.imwrite, output_path, img)
+
+
+def draw_grid_detection_visualization(image_path, output_path=None, board_state=None, img=None, writer=None,
+                                      constraint_map=None):
     """
     Test: Create visual representation of detected grid and constraints.
     """
@@ -99,9 +219,9 @@ def draw_grid_detection_visualization(image_path, output_path=None):
     print("-" * 60)
 
     try:
-        # Load and parse image
-        parser = TangoImageParser()
-        img = cv2.imread(image_path)
+        # Load and parse image unless the caller already did
+        if img is None:
+            img = load_image(image_path)
         if img is None:
             print(f"❌ Could not load image: {image_path}")
             return False
@@ -109,7 +229,8 @@ def draw_grid_detection_visualization(image_path, output_path=None):
         # Load piece templates
         piece_templates = load_piece_templates()
 
-        board_state = parser.parse_image(image_path)
+        if board_state is None:
+            board_state = TangoImageParser().parse_image(image_path)
 
         if not board_state:
             print("❌ Could not parse image")
@@ -125,46 +246,32 @@ def draw_grid_detection_visualization(image_path, output_path=None):
 
         # Create clean visualization like comprehensive version
         vis_size = 600
-        vis_img = np.ones((vis_size, vis_size, 3), dtype=np.uint8) * 240  # Light gray background
+        vis_img = np.full((vis_size, vis_size, 3), 240, dtype=np.uint8)  # Light gray background
 
         cell_size = vis_size // 6
 
-        # Create constraint map for coloring
-        constraint_map = {}
-        for constraint in constraints:
-            pos1 = constraint['pos1']
-            pos2 = constraint['pos2']
-            constraint_type = constraint['type']
+        # Create constraint map for coloring unless the caller already did
+        if constraint_map is None:
+            constraint_map = build_constraint_map(constraints)
 
-            for pos in [pos1, pos2]:
-                if pos not in constraint_map:
-                    constraint_map[pos] = []
-                constraint_map[pos].append(constraint_type)
+        # Determine cell background colors, white for no constraints
+        cell_colors = np.full((6, 6, 3), 255, dtype=np.uint8)
+        for (row, col), constraint_types in constraint_map.items():
+            if '=' in constraint_types and 'x' in constraint_types:
+                cell_colors[row, col] = (200, 150, 255)  # Purple for mixed
+            elif '=' in constraint_types:
+                cell_colors[row, col] = (255, 200, 200)  # Light blue for equals
+            else:
+                cell_colors[row, col] = (200, 200, 255)  # Light red for not-equals
 
         # Draw enhanced grid with constraint coloring
+        draw_cell_grid(vis_img, cell_size, cell_colors)
+
         for row in range(6):
             for col in range(6):
                 x = col * cell_size
                 y = row * cell_size
 
-                # Determine cell background color
-                if (row, col) in constraint_map:
-                    constraint_types = constraint_map[(row, col)]
-                    if '=' in constraint_types and 'x' in constraint_types:
-                        bg_color = (200, 150, 255)  # Purple for mixed
-                    elif '=' in constraint_types:
-                        bg_color = (255, 200, 200)  # Light blue for equals
-                    else:
-                        bg_color = (200, 200, 255)  # Light red for not-equals
-                else:
-                    bg_color = (255, 255, 255)  # White for no constraints
-
-                # Draw cell background
-                cv2.rectangle(vis_img, (x + 2, y + 2), (x + cell_size - 2, y + cell_size - 2), bg_color, -1)
-
-                # Draw cell border
-                cv2.rectangle(vis_img, (x, y), (x + cell_size, y + cell_size), (100, 100, 100), 2)
-
                 # Add coordinate labels in top-left corner
                 cv2.putText(vis_img, f"{row},{col}", (x + 5, y + 20),
                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (128, 128, 128), 1)
@@ -176,7 +283,7 @@ def draw_grid_detection_visualization(image_path, output_path=None):
                     text_y = y + cell_size - 15
 
                     # Background for constraint text
-                    text_size = cv2.getTextSize(constraint_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
+                    text_size = _text_size(constraint_text, 0.8, 2)
                     cv2.rectangle(vis_img,
                                  (text_x - text_size[0]//2 - 5, text_y - text_size[1] - 5),
                                  (text_x + text_size[0]//2 + 5, text_y + 5),
@@ -198,43 +305,14 @@ def draw_grid_detection_visualization(image_path, output_path=None):
             draw_piece_with_template(vis_img, center_x, center_y, piece_type, piece_templates)
 
         # Draw constraint connections
-        for constraint in constraints:
-            pos1, pos2 = constraint['pos1'], constraint['pos2']
-            constraint_type = constraint['type']
-
-            x1 = pos1[1] * cell_size + cell_size // 2
-            y1 = pos1[0] * cell_size + cell_size // 2
-            x2 = pos2[1] * cell_size + cell_size // 2
-            y2 = pos2[0] * cell_size + cell_size // 2
-
-            # Draw connection line
-            color = (0, 100, 255) if constraint_type == '=' else (255, 0, 100)
-            cv2.line(vis_img, (x1, y1), (x2, y2), color, 6)
-
-            # Draw constraint symbol at midpoint
-            mid_x = (x1 + x2) // 2
-            mid_y = (y1 + y2) // 2
-
-            cv2.circle(vis_img, (mid_x, mid_y), 20, (255, 255, 255), -1)
-            cv2.circle(vis_img, (mid_x, mid_y), 20, (0, 0, 0), 3)
-
-            if constraint_type == "=":
-                # Adjust the center for "="
-                offset_x, offset_y = -15, 11
-            elif constraint_type == "x":
-                # Adjust the center for "x"
-                offset_x, offset_y = -10, 9
-            else:
-                offset_x, offset_y = -10, 10
-            cv2.putText(vis_img, constraint_type, (mid_x + offset_x, mid_y + offset_y),
-                       cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 3)
+        draw_constraint_connections(vis_img, constraints, cell_size)
 
         # Save visualization with fixed name (no timestamp)
         if output_path is None:
             # Save in project root directory
             output_path = str(Path(__file__).parent.parent / "tests/img/grid_detection_debug.png")
 
-        cv2.imwrite(output_path, vis_img)
+        save_image(output_path, vis_img, writer)
         print(f"✅ Visualization saved to: {output_path}")
 
         # Print constraint details
@@ -253,7 +331,7 @@ def draw_grid_detection_visualization(image_path, output_path=None):
         return False
 
 
-def draw_constraint_heatmap(image_path, output_path=None):
+def draw_constraint_heatmap(image_path, output_path=None, board_state=None, writer=None):
     """
     Test: Create constraint density heatmap.
     """
@@ -261,8 +339,8 @@ def draw_constraint_heatmap(image_path, output_path=None):
     print("-" * 50)
 
     try:
-        parser = TangoImageParser()
-        board_state = parser.parse_image(image_path)
+        if board_state is None:
+            board_state = TangoImageParser().parse_image(image_path)
 
         if not board_state:
             print("❌ Could not parse image")
@@ -273,10 +351,10 @@ def draw_constraint_heatmap(image_path, output_path=None):
         # Create heatmap matrix
         heatmap = np.zeros((6, 6), dtype=np.float32)
 
-        for constraint in constraints:
-            pos1, pos2 = constraint['pos1'], constraint['pos2']
-            heatmap[pos1[0], pos1[1]] += 1
-            heatmap[pos2[0], pos2[1]] += 1
+        # Count both endpoints of every constraint in one scatter-add
+        if constraints:
+            cells = np.array([(c['pos1'], c['pos2']) for c in constraints], dtype=np.intp).reshape(-1, 2)
+            np.add.at(heatmap, (cells[:, 0], cells[:, 1]), 1)
 
         # Normalize heatmap
         if heatmap.max() > 0:
@@ -284,35 +362,25 @@ def draw_constraint_heatmap(image_path, output_path=None):
 
         # Create visualization with clean style like comprehensive version
         vis_size = 600
-        vis_img = np.ones((vis_size, vis_size, 3), dtype=np.uint8) * 240  # Light gray background
+        vis_img = np.full((vis_size, vis_size, 3), 240, dtype=np.uint8)  # Light gray background
 
         cell_size = vis_size // 6
 
+        # Cell colors based on intensity, white for cells without constraints
+        cell_colors = np.full((6, 6, 3), 255, dtype=np.uint8)
+        cell_colors[heatmap > 0] = (220, 240, 255)  # Very light yellow
+        cell_colors[heatmap > 0.3] = (200, 220, 255)  # Light orange
+        cell_colors[heatmap > 0.7] = (180, 180, 255)  # Light red
+
         # Apply heatmap colors with clean style
+        draw_cell_grid(vis_img, cell_size, cell_colors)
+
         for row in range(6):
             for col in range(6):
                 x = col * cell_size
                 y = row * cell_size
                 intensity = heatmap[row, col]
 
-                # Draw white cell background first
-                cv2.rectangle(vis_img, (x + 2, y + 2), (x + cell_size - 2, y + cell_size - 2), (255, 255, 255), -1)
-
-                if intensity > 0:
-                    # Create color based on intensity
-                    if intensity > 0.7:
-                        color = (180, 180, 255)  # Light red
-                    elif intensity > 0.3:
-                        color = (200, 220, 255)  # Light orange
-                    else:
-                        color = (220, 240, 255)  # Very light yellow
-
-                    # Fill cell with intensity color
-                    cv2.rectangle(vis_img, (x + 2, y + 2), (x + cell_size - 2, y + cell_size - 2), color, -1)
-
-                # Draw cell border
-                cv2.rectangle(vis_img, (x, y), (x + cell_size, y + cell_size), (100, 100, 100), 2)
-
                 # Add coordinate labels
                 cv2.putText(vis_img, f"{row},{col}", (x + 5, y + 20),
                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (128, 128, 128), 1)
@@ -324,7 +392,7 @@ def draw_constraint_heatmap(image_path, output_path=None):
 
                     # Add background for intensity text
                     intensity_text = f"{intensity:.1f}"
-                    text_size = cv2.getTextSize(intensity_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
+                    text_size = _text_size(intensity_text, 0.8, 2)
                     cv2.rectangle(vis_img,
                                  (center_x - text_size[0]//2 - 5, center_y - text_size[1]//2 - 5),
                                  (center_x + text_size[0]//2 + 5, center_y + text_size[1]//2 + 5),
@@ -339,7 +407,7 @@ def draw_constraint_heatmap(image_path, output_path=None):
             # Save in project root directory
             output_path = str(Path(__file__).parent.parent / "tests/img/constraint_heatmap.png")
 
-        cv2.imwrite(output_path, vis_img)
+        save_image(output_path, vis_img, writer)
         print(f"✅ Constraint heatmap saved to: {output_path}")
 
         # Print statistics
@@ -359,7 +427,7 @@ def draw_constraint_heatmap(image_path, output_path=None):
         return False
 
 
-def test_visual_solver_progress(image_path, output_path=None):
+def test_visual_solver_progress(image_path, output_path=None, board_state=None, writer=None):
     """
     Test: Visualize solver progress step by step.
     """
@@ -368,8 +436,8 @@ def test_visual_solver_progress(image_path, output_path=None):
 
     try:
         # Parse and setup solver
-        parser = TangoImageParser()
-        board_state = parser.parse_image(image_path)
+        if board_state is None:
+            board_state = TangoImageParser().parse_image(image_path)
 
         # Load piece templates
         piece_templates = load_piece_templates()
@@ -395,79 +463,44 @@ def test_visual_solver_progress(image_path, output_path=None):
 
         # Create clean visualization like comprehensive version
         vis_size = 600
-        vis_img = np.ones((vis_size, vis_size, 3), dtype=np.uint8) * 240  # Light gray background
+        vis_img = np.full((vis_size, vis_size, 3), 240, dtype=np.uint8)  # Light gray background
 
         cell_size = vis_size // 6
 
         # Draw solution with clean style
+        draw_cell_grid(vis_img, cell_size, np.full((6, 6, 3), 255, dtype=np.uint8))
+
+        # Read the board as an array once, for drawing and the summary
+        board = np.asarray(solver.board)
+
         for row in range(6):
             for col in range(6):
                 x = col * cell_size
                 y = row * cell_size
 
-                # Draw white cell background
-                cv2.rectangle(vis_img, (x + 2, y + 2), (x + cell_size - 2, y + cell_size - 2), (255, 255, 255), -1)
-                cv2.rectangle(vis_img, (x, y), (x + cell_size, y + cell_size), (100, 100, 100), 2)
-
                 # Add coordinate labels
                 cv2.putText(vis_img, f"{row},{col}", (x + 5, y + 20),
                            cv2.FONT_HERSHEY_SIMPLEX, 0.4, (128, 128, 128), 1)
 
-                center_x = x + cell_size // 2
-                center_y = y + cell_size // 2
-
-                piece_value = solver.board[row][col]
-
-                if piece_value == 0:  # Moon
-                    draw_piece_with_template(vis_img, center_x, center_y, 0, piece_templates)
-                elif piece_value == 1:  # Sun
-                    draw_piece_with_template(vis_img, center_x, center_y, 1, piece_templates)
+        # Draw the pieces, visiting only the filled cells (0 = moon, 1 = sun)
+        for row, col in np.argwhere(board != -1).tolist():
+            center_x = col * cell_size + cell_size // 2
+            center_y = row * cell_size + cell_size // 2
+            draw_piece_with_template(vis_img, center_x, center_y, int(board[row, col]), piece_templates)
 
-        # Draw constraints as lines between cells with clean style
-        for constraint in board_state['constraints']:
-            pos1, pos2 = constraint['pos1'], constraint['pos2']
-            constraint_type = constraint['type']
-
-            x1 = pos1[1] * cell_size + cell_size // 2
-            y1 = pos1[0] * cell_size + cell_size // 2
-            x2 = pos2[1] * cell_size + cell_size // 2
-            y2 = pos2[0] * cell_size + cell_size // 2
-
-            # Draw constraint line
-            color = (0, 100, 255) if constraint_type == '=' else (255, 0, 100)
-            cv2.line(vis_img, (x1, y1), (x2, y2), color, 6)
-
-            # Draw constraint symbol at midpoint with better visibility
-            mid_x = (x1 + x2) // 2
-            mid_y = (y1 + y2) // 2
-
-            # Add background circle for constraint symbol
-            cv2.circle(vis_img, (mid_x, mid_y), 20, (255, 255, 255), -1)
-            cv2.circle(vis_img, (mid_x, mid_y), 20, (0, 0, 0), 3)
-
-            if constraint_type == "=":
-                # Adjust the center for "="
-                offset_x, offset_y = -15, 11
-            elif constraint_type == "x":
-                # Adjust the center for "x"
-                offset_x, offset_y = -10, 9
-            else:
-                offset_x, offset_y = -10, 10
-            cv2.putText(vis_img, constraint_type, (mid_x + offset_x, mid_y + offset_y),
-                       cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 3)
+        # Draw constraint connections
+        draw_constraint_connections(vis_img, board_state['constraints'], cell_size)
 
         # Save solved visualization with fixed name
         if output_path is None:
             # Save in project root directory
             output_path = str(Path(__file__).parent.parent / "tests/img/solved_board.png")
 
-        cv2.imwrite(output_path, vis_img)
+        save_image(output_path, vis_img, writer)
         print(f"✅ Solved board visualization saved to: {output_path}")
 
         # Print solution summary
-        empty_cells = sum(1 for row in range(6) for col in range(6) if solver.board[row][col] == -1)
-        moons = sum(1 for row in range(6) for col in range(6) if solver.board[row][col] == 0)
-        suns = sum(1 for row in range(6) for col in range(6) if solver.board[row][col] == 1)
+        empty_cells, moons, suns = (int(count) for count in np.bincount(board.ravel() + 1, minlength=3)[:3])
 
         print("📊 Solution summary:")
         print(f"   • Status: {'✅ Solved' if solved else '❌ Unsolved'}")
@@ -482,7 +515,8 @@ def test_visual_solver_progress(image_path, output_path=None):
         return False
 
 
-def create_comprehensive_visualization(image_path, output_path=None):
+def create_comprehensive_visualization(image_path, output_path=None, board_state=None, img=None, writer=None,
+                                       constraint_map=None):
     """
     Test: Create a comprehensive, highly readable visualization.
     """
@@ -490,9 +524,9 @@ def create_comprehensive_visualization(image_path, output_path=None):
     print("-" * 70)
 
     try:
-        # Load and parse image
-        parser = TangoImageParser()
-        img = cv2.imread(image_path)
+        # Load and parse image unless the caller already did
+        if img is None:
+            img = load_image(image_path)
         if img is None:
             print(f"❌ Could not load image: {image_path}")
             return False
@@ -500,7 +534,8 @@ def create_comprehensive_visualization(image_path, output_path=None):
         # Load piece templates
         piece_templates = load_piece_templates()
 
-        board_state = parser.parse_image(image_path)
+        if board_state is None:
+            board_state = TangoImageParser().parse_image(image_path)
         if not board_state:
             print("❌ Could not parse image")
             return False
@@ -508,67 +543,50 @@ def create_comprehensive_visualization(image_path, output_path=None):
         fixed_pieces = board_state['fixed_pieces']
         constraints = board_state['constraints']
 
-        # Create larger visualization for better readability
+        # Create larger visualization for better readability on a light gray
+        # background with room for the legend; the board is drawn into a view of its left part
         vis_size = 800
-        vis_img = np.ones((vis_size, vis_size, 3), dtype=np.uint8) * 240  # Light gray background
+        legend_width = 450  # Wider legend
+        expanded_img = np.full((vis_size, vis_size + legend_width + 50, 3), 240, dtype=np.uint8)
+        vis_img = expanded_img[:, :vis_size]
 
         cell_size = vis_size // 6
 
-        # Draw enhanced grid
-        for row in range(6):
-            for col in range(6):
-                x = col * cell_size
-                y = row * cell_size
+        # Create constraint map for coloring unless the caller already did
+        if constraint_map is None:
+            constraint_map = build_constraint_map(constraints)
 
-                # Draw cell background (white)
-                cv2.rectangle(vis_img, (x + 2, y + 2), (x + cell_size - 2, y + cell_size - 2), (255, 255, 255), -1)
+        # Determine cell colors based on constraints, white for the rest
+        cell_colors = np.full((6, 6, 3), 255, dtype=np.uint8)
+        for (row, col), constraint_types in constraint_map.items():
+            if '=' in constraint_types and 'x' in constraint_types:
+                cell_colors[row, col] = (200, 150, 255)  # Purple for mixed
+            elif '=' in constraint_types:
+                cell_colors[row, col] = (255, 200, 200)  # Light blue for equals
+            else:
+                cell_colors[row, col] = (200, 200, 255)  # Light red for not-equals
 
-                # Draw cell border
-                cv2.rectangle(vis_img, (x, y), (x + cell_size, y + cell_size), (100, 100, 100), 2)
+        # Draw enhanced grid
+        draw_cell_grid(vis_img, cell_size, cell_colors)
 
+        for row in range(6):
+            for col in range(6):
                 # Add coordinate labels in top-left corner
-                cv2.putText(vis_img, f"{row},{col}", (x + 5, y + 20),
+                cv2.putText(vis_img, f"{row},{col}", (col * cell_size + 5, row * cell_size + 20),
                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (128, 128, 128), 1)
 
-        # Create constraint map for coloring
-        constraint_map = {}
-        for constraint in constraints:
-            pos1, pos2 = constraint['pos1'], constraint['pos2']
-            constraint_type = constraint['type']
-
-            for pos in [pos1, pos2]:
-                if pos not in constraint_map:
-                    constraint_map[pos] = []
-                constraint_map[pos].append(constraint_type)
-
-        # Color cells with constraints
+        # Label cells with constraints
         for (row, col), constraint_types in constraint_map.items():
             x = col * cell_size
             y = row * cell_size
 
-            # Determine cell color based on constraints
-            if '=' in constraint_types and 'x' in constraint_types:
-                color = (200, 150, 255)  # Purple for mixed
-            elif '=' in constraint_types:
-                color = (255, 200, 200)  # Light blue for equals
-            else:
-                color = (200, 200, 255)  # Light red for not-equals
-
-            # Fill cell with constraint color
-            cv2.rectangle(vis_img, (x + 2, y + 2), (x + cell_size - 2, y + cell_size - 2), color, -1)
-            cv2.rectangle(vis_img, (x, y), (x + cell_size, y + cell_size), (100, 100, 100), 2)
-
-            # Add coordinate labels
-            cv2.putText(vis_img, f"{row},{col}", (x + 5, y + 20),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (128, 128, 128), 1)
-
             # Add constraint symbols at bottom
             constraint_text = " ".join(constraint_types)
             text_x = x + cell_size // 2
             text_y = y + cell_size - 10
 
             # Background for constraint text
-            text_size = cv2.getTextSize(constraint_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
+            text_size = _text_size(constraint_text, 0.8, 2)
             cv2.rectangle(vis_img,
                          (text_x - text_size[0]//2 - 5, text_y - text_size[1] - 5),
                          (text_x + text_size[0]//2 + 5, text_y + 5),
@@ -594,50 +612,16 @@ def create_comprehensive_visualization(image_path, output_path=None):
                 draw_piece_with_template(vis_img, center_x, center_y, 1, piece_templates, size=70)
 
         # Draw constraint connections
-        for constraint in constraints:
-            pos1, pos2 = constraint['pos1'], constraint['pos2']
-            constraint_type = constraint['type']
-
-            x1 = pos1[1] * cell_size + cell_size // 2
-            y1 = pos1[0] * cell_size + cell_size // 2
-            x2 = pos2[1] * cell_size + cell_size // 2
-            y2 = pos2[0] * cell_size + cell_size // 2
-
-            # Draw connection line
-            color = (0, 100, 255) if constraint_type == '=' else (255, 0, 100)
-            cv2.line(vis_img, (x1, y1), (x2, y2), color, 6)
-
-            # Draw constraint symbol at midpoint
-            mid_x = (x1 + x2) // 2
-            mid_y = (y1 + y2) // 2
-
-            cv2.circle(vis_img, (mid_x, mid_y), 20, (255, 255, 255), -1)
-            cv2.circle(vis_img, (mid_x, mid_y), 20, (0, 0, 0), 3)
-
-            if constraint_type == "=":
-                # Adjust the center for "="
-                offset_x, offset_y = -15, 11
-            elif constraint_type == "x":
-                # Adjust the center for "x"
-                offset_x, offset_y = -10, 9
-            else:
-                offset_x, offset_y = -10, 10
-            cv2.putText(vis_img, constraint_type, (mid_x + offset_x, mid_y + offset_y),
-                       cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 3)
+        draw_constraint_connections(vis_img, constraints, cell_size)
 
         # Add comprehensive legend with improved readability
         legend_x = vis_size + 40  # More space from grid
         legend_y = 60
-        legend_width = 450  # Wider legend
 
         # Calculate content first to determine proper height
         content_height = 425
         # legend_height = content_height  # Dynamic height based on content
 
-        # Expand image to include larger legend
-        expanded_img = np.ones((vis_size, vis_size + legend_width + 50, 3), dtype=np.uint8) * 240
-        expanded_img[:vis_size, :vis_size] = vis_img
-
         # Legend background - properly sized to contain all content
         cv2.rectangle(expanded_img, (legend_x - 15, legend_y - 40),
                      (legend_x + legend_width - 15, legend_y + content_height + 20), (255, 255, 255), -1)
@@ -718,7 +702,7 @@ def create_comprehensive_visualization(image_path, output_path=None):
             # Save in project root directory
             output_path = str(Path(__file__).parent.parent / "tests/img/comprehensive_visualization.png")
 
-        cv2.imwrite(output_path, expanded_img)
+        save_image(output_path, expanded_img, writer)
         print(f"✅ Comprehensive visualization saved to: {output_path}")
 
         return True
@@ -728,30 +712,31 @@ def create_comprehensive_visualization(image_path, output_path=None):
         return False
 
 
-if __name__ == "__main__":
-    import sys
-
-    # Determine image to use
-    if len(sys.argv) > 1:
-        image_path = sys.argv[1]
-    else:
-        image_path = None
-        if not image_path:
-            print("❌ No image found. Please provide image path as argument.")
-            print("Usage: python3 -m tests.test_visual_debug [image_path]")
-            sys.exit(1)
-
+def run(image_path=None, create_gif=False):
+    """Run the visual debugging tests; the entry point the test runner calls in-process."""
     print("🎯 VISUAL DEBUGGING TESTS")
     print("=" * 60)
     print(f"Processing image: {image_path}")
     print()
 
+    # Load and parse the image once for all visual tests; each test only
+    # reads the board state
+    img = load_image(image_path)
+    board_state = TangoImageParser().parse_image(image_path)
+    constraint_map = build_constraint_map(board_state['constraints']) if board_state else None
+
+    # The PNG encodes run on a writer thread pool and overlap with drawing the
+    # next visualization; cv2.imwrite releases the GIL
+    writer = ThreadPoolExecutor(max_workers=4)
+
     # Run visual tests
     tests = [
-        lambda: draw_grid_detection_visualization(image_path),
-        lambda: draw_constraint_heatmap(image_path),
-        lambda: test_visual_solver_progress(image_path),
-        lambda: create_comprehensive_visualization(image_path),
+        lambda: draw_grid_detection_visualization(image_path, board_state=board_state, img=img, writer=writer,
+                                                   constraint_map=constraint_map),
+        lambda: draw_constraint_heatmap(image_path, board_state=board_state, writer=writer),
+        lambda: test_visual_solver_progress(image_path, board_state=board_state, writer=writer),
+        lambda: create_comprehensive_visualization(image_path, board_state=board_state, img=img, writer=writer,
+                                                    constraint_map=constraint_map),
     ]
 
     passed = 0
@@ -764,6 +749,8 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"❌ Unexpected error: {e}")
 
+    writer.shutdown(wait=True)
+
     print(f"\n📊 Visual tests completed: {passed}/{total} successful")
 
     if passed == total:
@@ -772,4 +759,20 @@ if __name__ == "__main__":
     else:
         print("❌ Some visualizations failed")
 
-    sys.exit(0 if passed == total else 1)
+    return passed == total
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Determine image to use
+    if len(sys.argv) > 1:
+        image_path = sys.argv[1]
+    else:
+        image_path = None
+        if not image_path:
+            print("❌ No image found. Please provide image path as argument.")
+            print("Usage: python3 -m tests.test_visual_debug [image_path]")
+            sys.exit(1)
+
+    sys.exit(0 if run(image_path) else 1)